@@ -1,26 +1,28 @@
-from fastapi import Request, Security, HTTPException
+from fastapi import Depends, Request, Security, HTTPException
 from fastapi.security import APIKeyHeader
 import httpx
-from app.core.config import settings
+from app.services.tenants import Tenant, tenant_registry
 
 API_KEY_NAME = "X-API-KEY"
-API_KEY = settings.EASYVISTA_TOOL_API_KEY
 
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
-def get_http_client(request: Request) -> httpx.AsyncClient:
+async def get_tenant(api_key: str = Security(api_key_header)) -> Tenant:
     """
-    Dependency to get the shared httpx.AsyncClient instance.
+    Dependency to validate the API key and resolve the tenant it belongs to.
     """
-    return request.app.state.http_client
+    if not tenant_registry.default.config.tool_api_key and not tenant_registry.tenants:
+        raise HTTPException(status_code=500, detail="API key not configured on server")
+    tenant = tenant_registry.resolve(api_key)
+    if tenant is None:
+        raise HTTPException(status_code=401, detail="Invalid API Key")
+    return tenant
 
-async def get_api_key(api_key: str = Security(api_key_header)):
+def get_http_client(request: Request, tenant: Tenant = Depends(get_tenant)) -> httpx.AsyncClient:
     """
-    Dependency to validate the API key.
+    Dependency to get the tenant's pooled httpx.AsyncClient instance. The
+    default tenant uses the application's shared client.
     """
-    if not API_KEY:
-        raise HTTPException(status_code=500, detail="API key not configured on server")
-    if api_key == API_KEY:
-        return api_key
-    else:
-        raise HTTPException(status_code=401, detail="Invalid API Key")
\ No newline at end of file
+    if tenant is tenant_registry.default:
+        return request.app.state.http_client
+    return tenant.client
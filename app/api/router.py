@@ -1,65 +1,191 @@
 # app/api/router.py
+import asyncio
 import logging
+import math
+import time
+import uuid
+from typing import Any, Awaitable, Dict
 from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 import httpx
 
+from app.core.config import settings
+from app.core.deadline import DeadlineExceeded, deadline_scope, remaining
+from app.core.logging_setup import DroppingQueueHandler, call_stats
 from app.models.rpc import RPCRequest, RPCResponse, RPCError, RPCException
 from app.services.mcp_easyvista_tools import dispatch
-from app.api.dependencies import get_http_client, get_api_key
+from app.api.dependencies import get_http_client, get_tenant
+from app.services import capture
+from app.services.scheduling import classify, lane_scope
+from app.services.tenants import Tenant, tenant_scope
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+DEADLINE_HEADER = "X-Request-Timeout"
+DEADLINE_PARAM = "_timeout"
+PRIORITY_HEADER = "X-Priority"
+PRIORITY_PARAM = "_priority"
+DISCONNECT_POLL_INTERVAL = 0.5
+
+class ClientDisconnected(Exception):
+    pass
+
+def _call_timeout(request: Request, params: dict) -> float | None:
+    """
+    Per-call budget in seconds, from the reserved params field or the header.
+    """
+    value = params.pop(DEADLINE_PARAM, None)
+    if value is None:
+        value = request.headers.get(DEADLINE_HEADER)
+    if value is None:
+        return settings.RPC_DEFAULT_TIMEOUT
+    try:
+        budget = float(value)
+    except (TypeError, ValueError):
+        budget = math.nan
+    if not math.isfinite(budget) or budget <= 0:
+        raise RPCException(RPCError(code=-32602, message=f"Invalid params: bad timeout {value!r}"))
+    return budget
+
+def _call_lane(request: Request, method: str, params: dict) -> str:
+    """
+    Scheduling lane of the call, from the client's hint or the method.
+    """
+    hint = params.pop(PRIORITY_PARAM, None) or request.headers.get(PRIORITY_HEADER)
+    try:
+        return classify(method, hint)
+    except ValueError as exc:
+        raise RPCException(RPCError(code=-32602, message=f"Invalid params: {exc}"))
+
+async def _run_cancellable(request: Request, call: Awaitable[Any]) -> Any:
+    """
+    Runs the call, cancelling it when the deadline passes or the HTTP client
+    goes away so no upstream work is spent on answers nobody will read.
+    """
+    task = asyncio.ensure_future(call)
+    try:
+        while True:
+            left = remaining()
+            timeout = DISCONNECT_POLL_INTERVAL if left is None else max(0.0, min(left, DISCONNECT_POLL_INTERVAL))
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+            if done:
+                return task.result()
+            if left is not None and left <= DISCONNECT_POLL_INTERVAL:
+                raise DeadlineExceeded()
+            if await request.is_disconnected():
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
+
+TOOLS_LIST = {
+    "methods": [
+        {"name": "create_ticket", "params": "CreateTicketArgs", "result": "Ticket"},
+        {"name": "update_ticket", "params": "UpdateTicketArgs", "result": "Ticket"},
+        {"name": "close_ticket", "params": "CloseTicketArgs", "result": "Ticket"},
+        {"name": "get_ticket", "params": "GetTicketArgs", "result": "Ticket"},
+        {"name": "list_tickets", "params": "TicketFilterArgs", "result": "List[Ticket]"},
+        {"name": "get_tickets_by_group", "params": "group_id: str", "result": "List[Ticket]"},
+        {"name": "get_tickets_by_status", "params": "status: str", "result": "List[Ticket]"},
+        {"name": "get_tickets_by_priority", "params": "priority: str", "result": "List[Ticket]"},
+        {"name": "generate_report", "params": "ReportArgs", "result": "str | DeltaReport"},
+        {"name": "aggregate_tickets", "params": "AggregateArgs", "result": "Aggregate"},
+        {"name": "search_tickets", "params": "SearchArgs", "result": "List[SearchHit]"},
+        {"name": "ticket_status_analytics", "params": "StatusAnalyticsArgs", "result": "StatusAnalytics"},
+    ]
+}
+
 @router.post("/mcp", response_model=RPCResponse)
 async def mcp_handler(
     request: Request,
     body: RPCRequest,
     client: httpx.AsyncClient = Depends(get_http_client),
-    api_key: str = Depends(get_api_key),
+    tenant: Tenant = Depends(get_tenant),
 ):
     """
     Generic JSON-RPC dispatcher for EasyVista operations.
     """
-    logger.info(f"RPC call {body.method} (id={body.id}) from {request.client.host}")
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    log_extra = {"request_id": request_id, "tenant": tenant.name, "method": body.method, "rpc_id": body.id}
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("rpc params", extra={**log_extra, "data": body.params})
+    if capture.recorder is not None:
+        capture.recorder.record_rpc(body.method, body.params)
+    stats: Dict[str, Any] = {}
+    token = call_stats.set(stats)
+    start = time.perf_counter()
+    try:
+        response = await _handle(request, body, client, tenant, log_extra)
+    finally:
+        call_stats.reset(token)
+    log_extra.update(stats, latency_ms=round((time.perf_counter() - start) * 1000, 1))
+    if response.error is None:
+        logger.info("rpc call ok", extra={**log_extra, "sampled": True})
+    else:
+        logger.warning("rpc call failed", extra={**log_extra, "error_code": response.error.code})
+    return response
+
+async def _handle(
+    request: Request, body: RPCRequest, client: httpx.AsyncClient, tenant: Tenant, log_extra: Dict[str, Any]
+) -> RPCResponse:
     try:
         if body.method == "tools/list":
-            result = {
-                "methods": [
-                    {"name": "create_ticket", "params": "CreateTicketArgs", "result": "Ticket"},
-                    {"name": "update_ticket", "params": "UpdateTicketArgs", "result": "Ticket"},
-                    {"name": "close_ticket", "params": "CloseTicketArgs", "result": "Ticket"},
-                    {"name": "get_ticket", "params": "rfc_number: str", "result": "Ticket"},
-                    {"name": "list_tickets", "params": "TicketFilterArgs", "result": "List[Ticket]"},
-                    {"name": "get_tickets_by_group", "params": "group_id: str", "result": "List[Ticket]"},
-                    {"name": "get_tickets_by_status", "params": "status: str", "result": "List[Ticket]"},
-                    {"name": "get_tickets_by_priority", "params": "priority: str", "result": "List[Ticket]"},
-                    {"name": "generate_report", "params": "ReportArgs", "result": "str"},
-                ]
-            }
+            result = TOOLS_LIST
         else:
-            result = await dispatch(client, body.method, body.params or {})
+            params = dict(body.params or {})
+            lane = log_extra["lane"] = _call_lane(request, body.method, params)
+            with tenant_scope(tenant), lane_scope(lane), deadline_scope(_call_timeout(request, params)):
+                result = await _run_cancellable(request, dispatch(client, body.method, params))
         return RPCResponse(result=result, id=body.id)
+    except ClientDisconnected:
+        logger.info("Client disconnected, call cancelled", extra=log_extra)
+        error = RPCError(code=-32002, message="Client disconnected")
+        return RPCResponse(error=error, id=body.id)
     except RPCException as exc:
-        logger.warning(f"RPCException processing method {body.method}: {exc.error.message}")
+        logger.warning("RPCException: %s", exc.error.message, extra=log_extra)
         return RPCResponse(error=exc.error, id=body.id)
     except ValidationError as exc:
-        logger.warning(f"Invalid parameters for method {body.method}: {exc}")
+        logger.warning("Invalid parameters: %s", exc, extra=log_extra)
         error = RPCError(code=-32602, message=f"Invalid params: {exc}")
         return RPCResponse(error=error, id=body.id)
     except ValueError as exc:
-        logger.warning(f"Method not found for method {body.method}: {exc}")
+        logger.warning("Method not found: %s", exc, extra=log_extra)
         error = RPCError(code=-32601, message=f"Method not found: {exc}")
         return RPCResponse(error=error, id=body.id)
     except httpx.RequestError as exc:
-        logger.error(f"Network error while processing method {body.method}: {exc}")
+        logger.error("Network error: %s", exc, extra=log_extra)
         error = RPCError(code=-32000, message=f"Network error: {exc}")
         return RPCResponse(error=error, id=body.id)
     except Exception as exc:
-        logger.exception(f"An unexpected error occurred while processing method {body.method}")
+        logger.exception("An unexpected error occurred", extra=log_extra)
         error = RPCError(code=-32603, message=f"Internal server error: {exc}")
         return RPCResponse(error=error, id=body.id)
 
 @router.get("/health")
 async def health():
     return {"status": "ok"}
+
+@router.get("/metrics/lanes")
+async def lane_metrics(tenant: Tenant = Depends(get_tenant)):
+    """
+    Upstream scheduler queue-time metrics per priority lane for the caller's tenant.
+    """
+    return tenant.scheduler.metrics()
+
+@router.get("/metrics/logging")
+async def logging_metrics(tenant: Tenant = Depends(get_tenant)):
+    """
+    Log records dropped because the logging queue was full, since startup.
+    """
+    return {"dropped": DroppingQueueHandler.dropped}
+
+@router.get("/ready")
+async def ready(request: Request):
+    """
+    Readiness probe: passes only once startup warm-up has succeeded.
+    """
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "warming up"})
+    return {"status": "ready"}
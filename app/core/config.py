@@ -1,7 +1,8 @@
 # app/core/config.py
 import os
 from pathlib import Path
-from pydantic import BaseSettings, Field, AnyHttpUrl
+from typing import Literal
+from pydantic import BaseModel, BaseSettings, Field, AnyHttpUrl
 
 class Settings(BaseSettings):
     """
@@ -12,6 +13,68 @@ class Settings(BaseSettings):
     EASYVISTA_ACCOUNT_ID: str = Field(..., env="EASYVISTA_ACCOUNT_ID")
     EASYVISTA_TOOL_API_KEY: str = Field(..., env="EASYVISTA_TOOL_API_KEY")
 
+    # Whether the upstream honours the `fields` query parameter; when it does
+    # not, projections are applied locally after the response is received.
+    EASYVISTA_SUPPORTS_FIELDS: bool = Field(False, env="EASYVISTA_SUPPORTS_FIELDS")
+
+    # Whether the upstream pages tickets with its own `cursor`/`next_cursor`.
+    EASYVISTA_SUPPORTS_CURSOR: bool = Field(False, env="EASYVISTA_SUPPORTS_CURSOR")
+    # Whether the upstream honours `sort` and `updated_since`. Without either
+    # setting, cursor scans fall back to offset pages.
+    EASYVISTA_SUPPORTS_KEYSET: bool = Field(False, env="EASYVISTA_SUPPORTS_KEYSET")
+
+    # Hedged reads: a duplicate GET is sent once the first attempt is slower
+    # than this latency percentile, within a budget of extra upstream requests.
+    EASYVISTA_HEDGE_ENABLED: bool = Field(False, env="EASYVISTA_HEDGE_ENABLED")
+    EASYVISTA_HEDGE_PERCENTILE: float = Field(0.95, env="EASYVISTA_HEDGE_PERCENTILE")
+    EASYVISTA_HEDGE_BUDGET: float = Field(0.05, env="EASYVISTA_HEDGE_BUDGET")
+    EASYVISTA_HEDGE_MIN_DELAY: float = Field(0.05, env="EASYVISTA_HEDGE_MIN_DELAY")
+
+    # Number of ticket bodies kept for conditional GET revalidation (0 disables).
+    EASYVISTA_REVALIDATION_CACHE_SIZE: int = Field(1024, env="EASYVISTA_REVALIDATION_CACHE_SIZE")
+    # Number of closed tickets' status histories kept for analytics (0 disables).
+    EASYVISTA_HISTORY_CACHE_SIZE: int = Field(10000, env="EASYVISTA_HISTORY_CACHE_SIZE")
+
+    # Seconds between background rebuilds of each tenant's search index.
+    EASYVISTA_SEARCH_REFRESH_INTERVAL: float = Field(900.0, env="EASYVISTA_SEARCH_REFRESH_INTERVAL")
+
+    # Window, in seconds, in which update_ticket calls to the same ticket are
+    # merged into one upstream PUT (0 disables coalescing).
+    EASYVISTA_COALESCE_WINDOW: float = Field(0.0, env="EASYVISTA_COALESCE_WINDOW")
+
+    # JSON file of additional tenants, keyed by tenant name (see TenantConfig).
+    # It is re-read whenever it changes, without a restart.
+    EASYVISTA_TENANTS_FILE: Path | None = Field(None, env="EASYVISTA_TENANTS_FILE")
+    # Upstream connection and concurrency limits for the default tenant.
+    EASYVISTA_MAX_CONNECTIONS: int = Field(100, env="EASYVISTA_MAX_CONNECTIONS")
+    EASYVISTA_MAX_CONCURRENCY: int = Field(50, env="EASYVISTA_MAX_CONCURRENCY")
+    # Upstream slots only interactive calls may use (see app/services/scheduling.py).
+    EASYVISTA_INTERACTIVE_RESERVED: int = Field(5, env="EASYVISTA_INTERACTIVE_RESERVED")
+
+    # Startup warm-up: upstream connections opened per tenant before /ready
+    # passes, and whether open tickets are prefetched into the search index.
+    WARMUP_CONNECTIONS: int = Field(4, env="WARMUP_CONNECTIONS")
+    WARMUP_PREFETCH: bool = Field(False, env="WARMUP_PREFETCH")
+
+    # Structured logging: level, fraction of successful RPC calls logged, and
+    # size of the queue feeding the background log writer.
+    LOG_LEVEL: str = Field("INFO", env="LOG_LEVEL")
+    LOG_SUCCESS_SAMPLE_RATE: float = Field(1.0, env="LOG_SUCCESS_SAMPLE_RATE")
+    LOG_QUEUE_SIZE: int = Field(10000, env="LOG_QUEUE_SIZE")
+
+    # When set, inbound RPC calls and upstream exchanges are recorded to this
+    # JSON Lines file (gzip if it ends in .gz) for replay; see app/services/capture.py.
+    CAPTURE_FILE: Path | None = Field(None, env="CAPTURE_FILE")
+
+    # Deadline, in seconds, applied to JSON-RPC calls that do not send their own.
+    RPC_DEFAULT_TIMEOUT: float | None = Field(None, env="RPC_DEFAULT_TIMEOUT")
+
+    # Reports with at least this many rows are rendered on a worker pool
+    # ("thread" or "process") of REPORT_RENDER_WORKERS workers.
+    REPORT_RENDER_INLINE_ROWS: int = Field(2000, env="REPORT_RENDER_INLINE_ROWS")
+    REPORT_RENDER_POOL: Literal["thread", "process"] = Field("thread", env="REPORT_RENDER_POOL")
+    REPORT_RENDER_WORKERS: int = Field(2, ge=1, env="REPORT_RENDER_WORKERS")
+
     # Path handling
     BASE_DIR: Path = Path(__file__).resolve().parent.parent
     
@@ -19,4 +82,17 @@ class Settings(BaseSettings):
         env_file = ".env"
         env_file_encoding = 'utf-8'
 
+class TenantConfig(BaseModel):
+    """
+    One EasyVista account served by this process, selected by the X-API-KEY
+    its clients send.
+    """
+    tool_api_key: str
+    url: AnyHttpUrl
+    api_key: str
+    account_id: str
+    max_connections: int = Field(100, ge=1)
+    max_concurrency: int = Field(50, ge=1)
+    interactive_reserved: int = Field(5, ge=0)
+
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,48 @@
+# app/core/deadline.py
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from app.models.rpc import RPCError, RPCException
+
+# Absolute time.monotonic() by which the current JSON-RPC call must finish.
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+class DeadlineExceeded(RPCException):
+    def __init__(self):
+        super().__init__(RPCError(code=-32001, message="Deadline exceeded"))
+
+@contextmanager
+def deadline_scope(timeout: float | None) -> Iterator[None]:
+    """
+    Sets the deadline for everything awaited in this context, including tasks
+    created from it. A nested scope can only shorten the outer deadline.
+    """
+    deadline = _deadline.get()
+    if timeout is not None:
+        new_deadline = time.monotonic() + timeout
+        deadline = new_deadline if deadline is None else min(deadline, new_deadline)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> float | None:
+    """
+    Seconds left before the current deadline, or None if there is none.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+def check_deadline() -> float | None:
+    """
+    Returns the remaining budget, raising DeadlineExceeded once it is spent.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded()
+    return left
@@ -0,0 +1,107 @@
+# app/core/logging_setup.py
+import json
+import logging
+import queue
+import random
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict
+
+from app.core.config import settings
+
+# Extra attributes copied from log records into the JSON line.
+STRUCTURED_FIELDS = ("request_id", "tenant", "lane", "method", "rpc_id", "latency_ms", "upstream_status", "upstream_calls", "error_code")
+# Keys whose values are replaced before a record is emitted.
+REDACTED_FIELDS = frozenset({"title", "description", "comment", "params", "body", "api_key", "Authorization"})
+
+# Per-call counters written by the service layer and logged by the router.
+# The dict is shared, so updates from tasks spawned for the call are seen.
+call_stats: ContextVar[Dict[str, Any] | None] = ContextVar("call_stats", default=None)
+
+def record_upstream_status(status_code: int) -> None:
+    stats = call_stats.get()
+    if stats is not None:
+        stats["upstream_status"] = status_code
+        stats["upstream_calls"] = stats.get("upstream_calls", 0) + 1
+
+def redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: "[redacted]" if k in REDACTED_FIELDS else redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    return value
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                line[field] = value
+        if getattr(record, "data", None) is not None:
+            line["data"] = redact(record.data)
+        if record.exc_info:
+            line["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(line, default=str)
+
+class SuccessSampler(logging.Filter):
+    """
+    Keeps a fraction of records flagged `sampled=True` (routine successes);
+    everything else always passes.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "sampled", False) and self.rate < 1.0:
+            return random.random() < self.rate
+        return True
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread; when the queue is full the record
+    is dropped and counted instead of blocking the event loop.
+    """
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the listener thread; only freeze the message
+        # arguments here so later mutation of them cannot change the line.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+def setup_logging() -> QueueListener:
+    """
+    Routes all logging through a bounded queue to a JSON stream handler on a
+    background thread. Returns the started listener; stop it on shutdown.
+    """
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    stream = logging.StreamHandler()
+    stream.setFormatter(JsonFormatter())
+
+    handler = DroppingQueueHandler(log_queue)
+    handler.addFilter(SuccessSampler(settings.LOG_SUCCESS_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL)
+
+    listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -1,19 +1,42 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import logging
 import httpx
 
 from app.api.router import router as api_router
+from app.core.config import settings
+from app.core.logging_setup import setup_logging
+from app.services.capture import start_capture, stop_capture
+from app.services.rendering import shutdown_render_pool
+from app.services.tenants import tenant_registry
+from app.services.warmup import warm_up
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    app.state.http_client = httpx.AsyncClient(timeout=30)
+    log_listener = setup_logging()
+    limits = httpx.Limits(
+        max_connections=settings.EASYVISTA_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.EASYVISTA_MAX_CONNECTIONS,
+    )
+    app.state.http_client = httpx.AsyncClient(timeout=30, limits=limits)
+    app.state.ready = False
+    if settings.CAPTURE_FILE:
+        start_capture(settings.CAPTURE_FILE)
+    warmup_task = asyncio.create_task(warm_up(app))
+    tenants_task = asyncio.create_task(tenant_registry.watch())
     logging.info("EasyVista JSON‑RPC service started, HTTP client initialized.")
     yield
     # Shutdown
+    warmup_task.cancel()
+    tenants_task.cancel()
     await app.state.http_client.aclose()
+    await tenant_registry.aclose()
+    stop_capture()
+    shutdown_render_pool()
     logging.info("EasyVista JSON-RPC service stopped, HTTP client closed.")
+    log_listener.stop()
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -1,4 +1,57 @@
-from pydantic import BaseModel
+import base64
+import binascii
+import json
+from typing import Any, Dict, List
+from pydantic import BaseModel, validator
+
+# Fields a ticket may carry, used to validate projections requested by clients.
+TICKET_FIELDS = frozenset({
+    "rfc_number",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "category",
+    "group_id",
+    "support_team",
+    "assigned_to",
+    "created_at",
+    "updated_at",
+    "resolution_time_seconds",
+    "closing_comment",
+})
+
+def validate_fields(fields: List[str] | None) -> List[str] | None:
+    """
+    Checks a field projection against TICKET_FIELDS, dropping duplicates.
+    """
+    if fields is None:
+        return None
+    unknown = sorted(set(fields) - TICKET_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown ticket fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(fields))
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """
+    Packs pagination state into an opaque, URL-safe cursor string.
+    """
+    raw = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Unpacks a cursor from encode_cursor; the empty string starts a new scan.
+    """
+    if not cursor:
+        return {}
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(state, dict):
+        raise ValueError("Invalid cursor")
+    return state
 
 class TicketFilterArgs(BaseModel):
     group_id: str | None = None
@@ -7,3 +60,14 @@ class TicketFilterArgs(BaseModel):
     assigned_to: str | None = None
     limit: int = 50
     offset: int = 0
+    fields: List[str] | None = None
+    # Keyset pagination: pass "" for the first page, then each next_cursor.
+    cursor: str | None = None
+
+    _check_fields = validator("fields", allow_reuse=True)(validate_fields)
+
+    @validator("cursor")
+    def check_cursor(cls, v):
+        if v is not None:
+            decode_cursor(v)
+        return v
@@ -0,0 +1,112 @@
+# app/services/capture.py
+"""
+Opt-in recording of inbound RPC calls and upstream EasyVista exchanges.
+
+The capture file is JSON Lines (gzip-compressed when the name ends in
+`.gz`). Every line is one event with `t`, its offset in seconds from the
+start of the capture, and a `type`:
+
+- `rpc`: an inbound call, with `method` and `params`.
+- `upstream`: a request to EasyVista, with `method`, `path`, `query`,
+  `body`, the response `status`, `latency` in seconds and the response
+  `response` body.
+
+Credentials are never written: request headers are not recorded, and
+`account_id` and key fields are removed from RPC params, upstream queries,
+request bodies and response bodies. mock_api replays the
+upstream events (MOCK_REPLAY_FILE), and replay_driver.py replays the rpc
+events against the service.
+"""
+import gzip
+import json
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+SECRET_FIELDS = frozenset({"account_id", "api_key", "Authorization"})
+
+def _scrub(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _scrub(v) for k, v in value.items() if k not in SECRET_FIELDS}
+    if isinstance(value, list):
+        return [_scrub(v) for v in value]
+    return value
+
+class TrafficRecorder:
+    """
+    Appends capture events from a background thread so the event loop never
+    waits on file I/O. Events are dropped if the writer falls behind.
+    """
+
+    def __init__(self, path: Path, max_pending: int = 10000):
+        self.path = path
+        self.start = time.monotonic()
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._write, name="traffic-recorder", daemon=True)
+        self._thread.start()
+
+    def _write(self) -> None:
+        opener = gzip.open if self.path.suffix == ".gz" else open
+        with opener(self.path, "at", encoding="utf-8") as out:
+            while True:
+                event = self._queue.get()
+                if event is None:
+                    return
+                out.write(json.dumps(event, separators=(",", ":"), default=str) + "\n")
+
+    def _put(self, event: Dict[str, Any]) -> None:
+        event["t"] = round(time.monotonic() - self.start, 4)
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def record_rpc(self, method: str, params: Dict[str, Any] | None) -> None:
+        self._put({"type": "rpc", "method": method, "params": _scrub(params or {})})
+
+    def record_upstream(
+        self,
+        method: str,
+        url: str,
+        query: Dict[str, Any] | None,
+        body: Any,
+        status: int,
+        latency: float,
+        response: Any,
+    ) -> None:
+        self._put({
+            "type": "upstream",
+            "method": method,
+            "path": urlsplit(url).path,
+            "query": _scrub({k: str(v) for k, v in (query or {}).items()}),
+            "body": _scrub(body),
+            "status": status,
+            "latency": round(latency, 4),
+            "response": _scrub(response),
+        })
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        if self.dropped:
+            logger.warning("Traffic capture dropped %d events", self.dropped)
+
+recorder: TrafficRecorder | None = None
+
+def start_capture(path: Path) -> None:
+    global recorder
+    recorder = TrafficRecorder(path)
+    logger.info("Capturing upstream traffic to %s", path)
+
+def stop_capture() -> None:
+    global recorder
+    if recorder is not None:
+        recorder.close()
+        recorder = None
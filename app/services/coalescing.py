@@ -0,0 +1,92 @@
+# app/services/coalescing.py
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+class _Batch(Generic[T]):
+    def __init__(self):
+        self.params: Dict[str, Any] = {}
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.flush_task: asyncio.Task | None = None
+        self.flush_now = asyncio.Event()
+
+class WriteCoalescer(Generic[T]):
+    """
+    Merges writes to the same key that arrive within `window` seconds into a
+    single upstream call.
+
+    Parameters are merged last-writer-wins; a field written again moves to
+    the end so the merged payload keeps the order in which fields were last
+    set. Every caller in the batch receives the same result (or error).
+
+    The flush runs in an empty context, not the first caller's: no caller's
+    deadline, lane or tenant leaks into a write made for all of them, so
+    `send` must set up whatever state it needs.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self.pending: Dict[str, _Batch[T]] = {}
+        # Last batch handed over for sending per key, so later writes can
+        # wait for it.
+        self.in_flight: Dict[str, _Batch[T]] = {}
+        self.flushes = 0
+
+    async def submit(
+        self, key: str, params: Dict[str, Any], send: Callable[[Dict[str, Any]], Awaitable[T]]
+    ) -> T:
+        batch = self.pending.get(key)
+        if batch is None:
+            batch = self.pending[key] = _Batch()
+            batch.flush_task = asyncio.get_running_loop().create_task(
+                self._flush(key, batch, send), context=contextvars.Context()
+            )
+        for field, value in params.items():
+            batch.params.pop(field, None)
+            batch.params[field] = value
+        # Shield so one caller giving up does not cancel the write for the others.
+        return await asyncio.shield(batch.future)
+
+    async def drain(self, key: str) -> None:
+        """
+        Sends any batch waiting for `key` now and waits until every batch for
+        it has been written, so a write made next is ordered after them.
+        Errors are left to the batch's own callers.
+        """
+        for batch in (self.pending.get(key), self.in_flight.get(key)):
+            if batch is not None:
+                batch.flush_now.set()
+                await asyncio.wait([asyncio.shield(batch.future)])
+
+    async def _flush(
+        self, key: str, batch: _Batch[T], send: Callable[[Dict[str, Any]], Awaitable[T]]
+    ) -> None:
+        try:
+            await asyncio.wait_for(batch.flush_now.wait(), self.window)
+        except asyncio.TimeoutError:
+            pass
+        if self.pending.get(key) is batch:
+            del self.pending[key]
+        # Batches for one key are sent one after another, in order.
+        previous = self.in_flight.get(key)
+        self.in_flight[key] = batch
+        self.flushes += 1
+        try:
+            if previous is not None:
+                await asyncio.wait([asyncio.shield(previous.future)])
+            result = await send(batch.params)
+        except asyncio.CancelledError:
+            batch.future.cancel()
+            raise
+        except Exception as exc:
+            batch.future.set_exception(exc)
+            # Every caller may already have given up; mark the error as
+            # retrieved so asyncio does not log it as unhandled.
+            batch.future.exception()
+        else:
+            batch.future.set_result(result)
+        finally:
+            if self.in_flight.get(key) is batch:
+                del self.in_flight[key]
@@ -0,0 +1,110 @@
+# app/services/hedging.py
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+class Hedger:
+    """
+    Sends a duplicate of a slow idempotent request once the first attempt has
+    been outstanding longer than a latency percentile, and returns whichever
+    attempt answers first.
+
+    Hedges are paid for from a budget: every primary request earns
+    `budget` tokens and every hedge spends one, so extra load stays below
+    that fraction of upstream traffic. A hedge also needs a concurrency
+    slot: `reserve` must grant one without waiting, and `release` is called
+    once the hedge is done.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        min_delay: float = 0.05,
+        window: int = 1000,
+        min_samples: int = 20,
+        recompute_every: int = 50,
+    ):
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.recompute_every = recompute_every
+        self.latencies: deque = deque(maxlen=window)
+        self.tokens = 0.0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._quantile: float | None = None
+        self._new_samples = 0
+
+    def record(self, latency: float) -> None:
+        self.latencies.append(latency)
+        self._new_samples += 1
+
+    def delay(self) -> float:
+        """
+        Seconds to wait for the first attempt before hedging. The percentile
+        is recomputed every `recompute_every` samples, not on every call.
+        """
+        if len(self.latencies) < self.min_samples:
+            return max(self.min_delay, 1.0)
+        if self._quantile is None or self._new_samples >= self.recompute_every:
+            ordered = sorted(self.latencies)
+            self._quantile = ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+            self._new_samples = 0
+        return max(self.min_delay, self._quantile)
+
+    def _try_spend(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    async def _timed(self, send: Callable[[], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        try:
+            return await send()
+        finally:
+            # Cancelled attempts (a slow primary that lost to its hedge)
+            # count too, as a lower bound; leaving them out would drag the
+            # percentile down and make hedging ever more aggressive.
+            self.record(time.perf_counter() - start)
+
+    async def run(
+        self,
+        send: Callable[[], Awaitable[T]],
+        reserve: Callable[[], bool] = lambda: True,
+        release: Callable[[], None] = lambda: None,
+    ) -> T:
+        # Cap the balance so a long quiet period cannot fund a burst of hedges.
+        self.tokens = min(self.tokens + self.budget, 10.0)
+        primary = asyncio.ensure_future(self._timed(send))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.delay())
+            if done or self.tokens < 1.0 or not reserve():
+                return await primary
+            self._try_spend()
+
+            self.hedges_sent += 1
+            hedge = asyncio.ensure_future(self._timed(send))
+            # A done callback runs even if the hedge is cancelled before it starts.
+            hedge.add_done_callback(lambda _: release())
+            pending.add(hedge)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    if winner is hedge:
+                        self.hedges_won += 1
+                    return winner.result()
+                if not pending:
+                    # Both attempts failed; surface the primary's error.
+                    return await primary
+        finally:
+            for task in pending:
+                if not task.done():
+                    task.cancel()
@@ -1,14 +1,33 @@
 # app/services/mcp_easyvista_tools.py
+import asyncio
+import contextvars
+import logging
 import os
-from typing import Dict, List, Any
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Any
 import httpx
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 from fastapi.responses import JSONResponse
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception_type, retry_if_not_exception_type, stop_after_attempt, wait_exponential
 
 from app.models.rpc import RPCError, RPCException
-from app.models.reporting import TicketFilterArgs
+from app.models.reporting import TicketFilterArgs, decode_cursor, encode_cursor, validate_fields
 from app.core.config import settings
+from app.core.deadline import DeadlineExceeded, check_deadline, remaining
+from app.core.logging_setup import record_upstream_status
+from app.services import capture
+from app.services.rendering import render
+from app.services.status_analytics import StatusAnalytics, is_terminal
+from app.services.scheduling import BULK, INTERACTIVE, current_lane, lane_scope
+from app.services.search_index import TicketSearchIndex
+from app.services.tenants import Tenant, current_tenant, tenant_scope
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a failed search index rebuild is retried.
+SEARCH_RETRY_INTERVAL = 30.0
 
 class CreateTicketArgs(BaseModel):
     title: str = Field(..., description="Ticket title")
@@ -26,36 +45,179 @@ class CloseTicketArgs(BaseModel):
     rfc_number: str = Field(..., description="RFC number of the ticket")
     comment: str = Field(..., description="Closing comment")
 
+class GetTicketArgs(BaseModel):
+    rfc_number: str = Field(..., description="RFC number of the ticket")
+    fields: List[str] | None = Field(None, description="Ticket fields to return")
+
+    _check_fields = validator("fields", allow_reuse=True)(validate_fields)
+
 class ReportArgs(BaseModel):
     report_type: str = Field(..., description="One of: summary, csv, html")
     filters: Dict[str, Any] | None = Field(
         None, description="Optional filters for the report"
     )
+    fields: List[str] | None = Field(None, description="Report columns")
+    since: str | None = Field(
+        None, description="Delta mode: only tickets created, updated or closed at or after this ISO timestamp"
+    )
+    since_token: str | None = Field(
+        None, description="Delta mode: the next_token returned by the previous delta report"
+    )
+
+    _check_fields = validator("fields", allow_reuse=True)(validate_fields)
+
+    @validator("since")
+    def check_since(cls, v):
+        if v is not None:
+            _parse_timestamp(v)
+        return v
+
+    @validator("since_token")
+    def check_since_token(cls, v):
+        if v is not None and "u" not in decode_cursor(v):
+            raise ValueError("Invalid since_token")
+        return v
+
+class AggregateArgs(BaseModel):
+    filters: Dict[str, Any] | None = Field(
+        None, description="Optional ticket filters, as for list_tickets"
+    )
+    group_by: List[str] = Field(["group_id"], description="Ticket fields to count by")
+    top_k: int = Field(5, ge=1, description="Number of top assignees to return")
+    page_size: int = Field(100, ge=1, le=1000, description="Tickets fetched per upstream page")
+
+    _check_group_by = validator("group_by", allow_reuse=True)(validate_fields)
+
+class SearchArgs(BaseModel):
+    query: str = Field(..., min_length=1, description="Words to look for in ticket titles and descriptions")
+    status: str | None = Field(None, description="Filter by status")
+    priority: str | None = Field(None, description="Filter by priority")
+    group_id: str | None = Field(None, description="Filter by group")
+    assigned_to: str | None = Field(None, description="Filter by assignee")
+    limit: int = Field(10, ge=1, le=100, description="Maximum number of results")
 
-def get_easyvista_config() -> Dict[str, str]:
+class StatusAnalyticsArgs(BaseModel):
+    filters: Dict[str, Any] | None = Field(
+        None, description="Optional ticket filters, as for list_tickets"
+    )
+    group_by: List[str] = Field(["priority"], description="Ticket fields to break the statistics down by")
+    sla_seconds: Dict[str, float] = Field(
+        {}, description="Longest time, in seconds, a ticket may stay in each status, e.g. {\"Open\": 14400}"
+    )
+    concurrency: int = Field(10, ge=1, le=50, description="History requests in flight at once")
+    page_size: int = Field(100, ge=1, le=1000, description="Tickets fetched per upstream page")
+
+    _check_group_by = validator("group_by", allow_reuse=True)(validate_fields)
+
+    @validator("sla_seconds")
+    def check_sla_seconds(cls, v):
+        if any(limit <= 0 for limit in v.values()):
+            raise ValueError("SLA limits must be positive")
+        return v
+
+# Columns rendered by each report type when no explicit fields are requested.
+REPORT_COLUMNS = {
+    "summary": ["rfc_number", "title", "status"],
+    "csv": ["rfc_number", "title", "status", "priority", "category", "assigned_to"],
+    "html": ["rfc_number", "title", "status"],
+}
+
+def get_easyvista_config() -> Dict[str, Any]:
     """
-    Returns a dictionary of the required EasyVista connection settings.
+    Returns the current tenant's EasyVista connection settings and the
+    request headers prebuilt from them.
     """
-    return {
-        "url": str(settings.EASYVISTA_URL).rstrip("/"),
-        "key": settings.EASYVISTA_API_KEY,
-        "account": settings.EASYVISTA_ACCOUNT_ID,
-    }
+    return current_tenant().upstream
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-async def _request(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> Any:
+def _response_body(resp: httpx.Response) -> Any:
+    if not resp.content:
+        return None
     try:
-        resp = await client.request(method, url, **kwargs)
-        resp.raise_for_status()
         return resp.json()
+    except ValueError:
+        return resp.text
+
+_backoff = wait_exponential(multiplier=1, min=2, max=10)
+
+def _wait_within_deadline(retry_state) -> float:
+    """
+    Exponential backoff, cut short so a retry never sleeps past the deadline.
+    """
+    delay = _backoff(retry_state)
+    left = remaining()
+    return delay if left is None else max(0.0, min(delay, left))
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=_wait_within_deadline,
+    # Only errors are retried: a cancelled call must stay cancelled.
+    retry=retry_if_exception_type(Exception) & retry_if_not_exception_type(DeadlineExceeded),
+)
+async def _request(
+    client: httpx.AsyncClient, method: str, url: str, revalidate: bool = False, **kwargs
+) -> Any:
+    left = check_deadline()
+    if left is not None:
+        kwargs.setdefault("timeout", min(left, client.timeout.read or left))
+    tenant = current_tenant()
+    cache_key = cached = None
+    if revalidate and method == "GET":
+        cache_key = tenant.revalidation_cache.key(url, kwargs.get("params"))
+        cached = tenant.revalidation_cache.lookup(cache_key)
+        if cached:
+            kwargs["headers"] = {**kwargs.get("headers", {}), **cached[0]}
+    try:
+        lane = current_lane()
+        async with tenant.scheduler.slot(lane):
+            sent_at = time.perf_counter()
+            if method == "GET" and settings.EASYVISTA_HEDGE_ENABLED:
+                resp = await tenant.hedger.run(
+                    lambda: client.request(method, url, **kwargs),
+                    reserve=lambda: tenant.scheduler.try_acquire(lane),
+                    release=lambda: tenant.scheduler.release(lane),
+                )
+            else:
+                resp = await client.request(method, url, **kwargs)
+        record_upstream_status(resp.status_code)
+        if capture.recorder is not None:
+            capture.recorder.record_upstream(
+                method, url, kwargs.get("params"), kwargs.get("json"), resp.status_code,
+                time.perf_counter() - sent_at, _response_body(resp),
+            )
+        if cached and resp.status_code == 304:
+            return tenant.revalidation_cache.not_modified(cache_key, cached[1])
+        resp.raise_for_status()
+        body = resp.json()
+        if cache_key:
+            tenant.revalidation_cache.store(cache_key, resp, body)
+        return body
     except httpx.HTTPStatusError as exc:
         raise RPCException(
             error=RPCError(
                 code=exc.response.status_code,
-                message=f"EasyVista API error: {exc.response.text}",
+                message=f"EasyVista API error: HTTP {exc.response.status_code}",
+                # The upstream body may echo ticket text: it goes back to the
+                # caller, but not into the message, which is logged.
+                data=_response_body(exc.response),
             )
         ) from exc
 
+def _project(ticket: Dict[str, Any], fields: List[str] | None) -> Dict[str, Any]:
+    """
+    Keeps only the requested fields of a ticket, preserving the requested order.
+    """
+    if not fields:
+        return ticket
+    return {k: ticket[k] for k in fields if k in ticket}
+
+def _fields_param(fields: List[str] | None) -> Dict[str, str]:
+    """
+    Query parameters asking the upstream to project fields, if it supports it.
+    """
+    if fields and settings.EASYVISTA_SUPPORTS_FIELDS:
+        return {"fields": ",".join(fields)}
+    return {}
+
 async def create_ticket(client: httpx.AsyncClient, args: CreateTicketArgs) -> Dict[str, Any]:
     cfg = get_easyvista_config()
     payload = {
@@ -67,98 +229,438 @@ async def create_ticket(client: httpx.AsyncClient, args: CreateTicketArgs) -> Di
         "support_team": args.support_team,
         "assigned_to": args.assigned_to,
     }
-    headers = {
-        "Authorization": f"Bearer {cfg['key']}",
-        "Content-Type": "application/json",
-    }
-    return await _request(
+    headers = cfg["write_headers"]
+    ticket = await _request(
         client, "POST", f"{cfg['url']}/api/v1/tickets", json=payload, headers=headers
     )
+    current_tenant().ticket_index.upsert({**payload, **ticket})
+    return ticket
 
-async def update_ticket(client: httpx.AsyncClient, args: UpdateTicketArgs) -> Dict[str, Any]:
+def _forget_cached(rfc_number: str) -> None:
+    """
+    Drops the stored ticket and history bodies of a ticket that was just
+    written. Their date validators have one-second granularity, so a read
+    in the same second could otherwise be answered 304 with the old body.
+    """
+    url = f"{get_easyvista_config()['url']}/api/v1/tickets/{rfc_number}"
+    current_tenant().revalidation_cache.invalidate(url, f"{url}/history")
+
+async def _put_ticket(client: httpx.AsyncClient, rfc_number: str, params: Dict[str, Any]) -> Dict[str, Any]:
     cfg = get_easyvista_config()
-    payload = {"account_id": cfg["account"], **args.params}
-    headers = {
-        "Authorization": f"Bearer {cfg['key']}",
-        "Content-Type": "application/json",
-    }
-    return await _request(
-        client, "PUT", f"{cfg['url']}/api/v1/tickets/{args.rfc_number}", json=payload, headers=headers
+    payload = {"account_id": cfg["account"], **params}
+    headers = cfg["write_headers"]
+    ticket = await _request(
+        client, "PUT", f"{cfg['url']}/api/v1/tickets/{rfc_number}", json=payload, headers=headers
     )
+    _forget_cached(rfc_number)
+    current_tenant().ticket_index.upsert({"rfc_number": rfc_number, **params, **ticket})
+    return ticket
+
+async def update_ticket(client: httpx.AsyncClient, args: UpdateTicketArgs) -> Dict[str, Any]:
+    tenant = current_tenant()
+    coalescer = tenant.update_coalescer
+    if coalescer.window > 0:
+        async def send(params: Dict[str, Any]) -> Dict[str, Any]:
+            # The merged write belongs to no single caller: it runs under the
+            # tenant only, without any caller's deadline, in the write lane.
+            with tenant_scope(tenant), lane_scope(INTERACTIVE):
+                return await _put_ticket(client, args.rfc_number, params)
+
+        return await coalescer.submit(args.rfc_number, args.params, send)
+    return await _put_ticket(client, args.rfc_number, args.params)
 
 async def close_ticket(client: httpx.AsyncClient, args: CloseTicketArgs) -> Dict[str, Any]:
+    # A coalesced update sent after the close could reopen the ticket.
+    await current_tenant().update_coalescer.drain(args.rfc_number)
     cfg = get_easyvista_config()
     payload = {
         "account_id": cfg["account"],
         "status": "closed",
         "comment": args.comment,
     }
-    headers = {
-        "Authorization": f"Bearer {cfg['key']}",
-        "Content-Type": "application/json",
-    }
-    return await _request(
+    headers = cfg["write_headers"]
+    ticket = await _request(
         client, "PUT", f"{cfg['url']}/api/v1/tickets/{args.rfc_number}/close", json=payload, headers=headers
     )
+    _forget_cached(args.rfc_number)
+    current_tenant().ticket_index.upsert(ticket)
+    return ticket
 
-async def get_ticket(client: httpx.AsyncClient, rfc_number: str) -> Dict[str, Any]:
+async def get_ticket(client: httpx.AsyncClient, rfc_number: str, fields: List[str] | None = None) -> Dict[str, Any]:
     cfg = get_easyvista_config()
-    headers = {
-        "Authorization": f"Bearer {cfg['key']}",
-        "Accept": "application/json",
-    }
-    return await _request(client, "GET", f"{cfg['url']}/api/v1/tickets/{rfc_number}", headers=headers)
+    headers = cfg["read_headers"]
+    ticket = await _request(
+        client, "GET", f"{cfg['url']}/api/v1/tickets/{rfc_number}",
+        params=_fields_param(fields), headers=headers, revalidate=True,
+    )
+    current_tenant().ticket_index.upsert(ticket)
+    return _project(ticket, fields)
 
 async def get_ticket_history(client: httpx.AsyncClient, rfc_number: str) -> List[Dict[str, Any]]:
     cfg = get_easyvista_config()
-    headers = {
-        "Authorization": f"Bearer {cfg['key']}",
-        "Accept": "application/json",
-    }
-    return await _request(client, "GET", f"{cfg['url']}/api/v1/tickets/{rfc_number}/history", headers=headers)
+    headers = cfg["read_headers"]
+    return await _request(
+        client, "GET", f"{cfg['url']}/api/v1/tickets/{rfc_number}/history", headers=headers, revalidate=True
+    )
 
 async def get_resolution_metrics(client: httpx.AsyncClient) -> Dict[str, float]:
     cfg = get_easyvista_config()
-    headers = {
-        "Authorization": f"Bearer {cfg['key']}",
-        "Accept": "application/json",
-    }
+    headers = cfg["read_headers"]
     return await _request(client, "GET", f"{cfg['url']}/api/v1/metrics/resolution", headers=headers)
 
-async def list_tickets(client: httpx.AsyncClient, filter_args: TicketFilterArgs) -> List[Dict[str, Any]]:
+def _parse_timestamp(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+# Sort key for keyset pagination, and the fields it needs from each ticket.
+CURSOR_FIELDS = ["updated_at", "rfc_number"]
+
+def _cursor_key(ticket: Dict[str, Any]) -> tuple:
+    updated_at = _parse_timestamp(ticket.get("updated_at")) or datetime.min.replace(tzinfo=timezone.utc)
+    return updated_at, ticket.get("rfc_number") or ""
+
+async def _fetch_tickets(
+    client: httpx.AsyncClient,
+    filter_args: TicketFilterArgs,
+    fields: List[str] | None,
+    index: bool = True,
+    **extra: Any,
+) -> Dict[str, Any]:
     cfg = get_easyvista_config()
     params = {"account_id": cfg["account"], "limit": filter_args.limit, "offset": filter_args.offset}
     for key in ("group_id", "status", "priority", "assigned_to"):
         val = getattr(filter_args, key)
         if val:
             params[key] = val
-    headers = {"Authorization": f"Bearer {cfg['key']}", "Accept": "application/json"}
+    params.update(_fields_param(fields))
+    params.update(extra)
+    headers = cfg["read_headers"]
     data = await _request(client, "GET", f"{cfg['url']}/api/v1/tickets", params=params, headers=headers)
-    return data.get("tickets", [])
+    if index:
+        current_tenant().ticket_index.upsert_many(data.get("tickets", []))
+    return data
+
+async def list_tickets(client: httpx.AsyncClient, filter_args: TicketFilterArgs, index: bool = True) -> Any:
+    """
+    Lists one page of tickets. With a `cursor` the result is a dict holding
+    the tickets and the `next_cursor` to pass for the following page.
+    `index=False` keeps the tickets out of the search index.
+    """
+    if filter_args.cursor is not None:
+        return await list_tickets_page(client, filter_args)
+    data = await _fetch_tickets(client, filter_args, filter_args.fields, index=index)
+    return [_project(t, filter_args.fields) for t in data.get("tickets", [])]
+
+async def list_tickets_page(client: httpx.AsyncClient, filter_args: TicketFilterArgs) -> Dict[str, Any]:
+    """
+    One page of a cursor scan. Upstream cursors are used when available,
+    then (updated_at, rfc_number) keyset pages when the upstream honours
+    `sort` and `updated_since`, and offset pages otherwise.
+    """
+    if settings.EASYVISTA_SUPPORTS_CURSOR:
+        return await _native_page(client, filter_args)
+    if settings.EASYVISTA_SUPPORTS_KEYSET:
+        return await _keyset_page(client, filter_args)
+    return await _offset_page(client, filter_args)
+
+async def _native_page(client: httpx.AsyncClient, filter_args: TicketFilterArgs) -> Dict[str, Any]:
+    state = decode_cursor(filter_args.cursor or "")
+    page_args = filter_args.copy(update={"offset": 0})
+    data = await _fetch_tickets(client, page_args, filter_args.fields, cursor=state.get("n", ""))
+    next_cursor = data.get("next_cursor")
+    return {
+        "tickets": [_project(t, filter_args.fields) for t in data.get("tickets", [])],
+        "next_cursor": encode_cursor({"n": next_cursor}) if next_cursor else None,
+    }
+
+async def _offset_page(client: httpx.AsyncClient, filter_args: TicketFilterArgs) -> Dict[str, Any]:
+    state = decode_cursor(filter_args.cursor or "")
+    page_args = filter_args.copy(update={"offset": state.get("o", 0)})
+    tickets = (await _fetch_tickets(client, page_args, filter_args.fields)).get("tickets", [])
+    next_cursor = None
+    if tickets and len(tickets) >= page_args.limit:
+        next_cursor = encode_cursor({"o": page_args.offset + len(tickets)})
+    return {"tickets": [_project(t, filter_args.fields) for t in tickets], "next_cursor": next_cursor}
+
+async def _keyset_page(client: httpx.AsyncClient, filter_args: TicketFilterArgs) -> Dict[str, Any]:
+    """
+    Keyset pagination ordered by (updated_at, rfc_number), so concurrent
+    writes neither skip nor repeat tickets and deep pages cost no more than
+    the first. Tickets without `updated_at` cannot be placed in that order
+    and are skipped, so every cursor moves strictly forward.
+    """
+    state = decode_cursor(filter_args.cursor or "")
+    fields = filter_args.fields and list(dict.fromkeys([*filter_args.fields, *CURSOR_FIELDS]))
+    page_args = filter_args.copy(update={"offset": 0})
+
+    after = (_parse_timestamp(state["u"]), state["r"]) if state.get("u") else None
+    extra = {"sort": ",".join(CURSOR_FIELDS)}
+    if after:
+        extra["updated_since"] = state["u"]
+    tickets: List[Dict[str, Any]] = []
+    skipped = 0
+    exhausted = False
+    # Tickets sharing the cursor's updated_at come back again; skip past them.
+    while len(tickets) < filter_args.limit:
+        page = (await _fetch_tickets(client, page_args, fields, **extra)).get("tickets", [])
+        for t in page:
+            if not t.get("updated_at"):
+                skipped += 1
+            elif after is None or _cursor_key(t) > after:
+                tickets.append(t)
+        if len(page) < page_args.limit:
+            exhausted = True
+            break
+        page_args.offset += page_args.limit
+    if skipped:
+        logger.warning("Skipped %d tickets without updated_at in a keyset scan", skipped)
+
+    tickets = tickets[:filter_args.limit]
+    next_cursor = None
+    if tickets and not (exhausted and len(tickets) < filter_args.limit):
+        last = tickets[-1]
+        next_cursor = encode_cursor({"u": last["updated_at"], "r": last.get("rfc_number") or ""})
+    return {"tickets": [_project(t, filter_args.fields) for t in tickets], "next_cursor": next_cursor}
+
+async def iter_tickets(
+    client: httpx.AsyncClient, filter_args: TicketFilterArgs
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yields every ticket matching the filters, fetching one keyset page at a time.
+    """
+    page_args = filter_args.copy(update={"cursor": ""})
+    while True:
+        page = await list_tickets_page(client, page_args)
+        for ticket in page["tickets"]:
+            yield ticket
+        if not page["next_cursor"]:
+            return
+        page_args.cursor = page["next_cursor"]
+
+async def aggregate_tickets(client: httpx.AsyncClient, args: AggregateArgs) -> Dict[str, Any]:
+    """
+    Counts matching tickets per group, ranks assignees and summarises ticket
+    ages in a single streamed pass, so only the totals are kept in memory.
+    """
+    fields = list(dict.fromkeys([*args.group_by, "assigned_to", "created_at"]))
+    filter_args = TicketFilterArgs(
+        **{**(args.filters or {}), "limit": args.page_size, "offset": 0, "fields": fields}
+    )
+    now = datetime.now(timezone.utc)
+    groups: Counter = Counter()
+    assignees: Counter = Counter()
+    total = 0
+    aged = 0
+    age_sum = 0.0
+    age_min = age_max = None
+
+    async for ticket in iter_tickets(client, filter_args):
+        total += 1
+        groups[tuple(ticket.get(k) for k in args.group_by)] += 1
+        if ticket.get("assigned_to"):
+            assignees[ticket["assigned_to"]] += 1
+        created_at = _parse_timestamp(ticket.get("created_at"))
+        if created_at is not None:
+            age = (now - created_at).total_seconds()
+            aged += 1
+            age_sum += age
+            age_min = age if age_min is None else min(age_min, age)
+            age_max = age if age_max is None else max(age_max, age)
+
+    return {
+        "total": total,
+        "groups": [
+            {**dict(zip(args.group_by, key)), "count": count}
+            for key, count in groups.most_common()
+        ],
+        "top_assignees": [
+            {"assigned_to": name, "count": count}
+            for name, count in assignees.most_common(args.top_k)
+        ],
+        "age_seconds": {
+            "min": age_min,
+            "max": age_max,
+            "avg": age_sum / aged if aged else None,
+        },
+    }
+
+async def rebuild_search_index(client: httpx.AsyncClient) -> None:
+    """
+    Scans every ticket into a fresh index and swaps it in, so tickets gone
+    upstream drop out. Writes made during the scan reach both indexes.
+    """
+    tenant = current_tenant()
+    live = tenant.ticket_index
+    fresh = TicketSearchIndex()
+    started = time.monotonic()
+    live.shadow = fresh
+    try:
+        async for _ in iter_tickets(client, TicketFilterArgs(limit=100)):
+            pass
+    finally:
+        live.shadow = None
+    fresh.loaded_at = started
+    tenant.ticket_index = fresh
+
+async def _refresh_search_index(tenant: Tenant, client: httpx.AsyncClient) -> None:
+    with tenant_scope(tenant), lane_scope(BULK):
+        while True:
+            try:
+                await rebuild_search_index(client)
+                delay = settings.EASYVISTA_SEARCH_REFRESH_INTERVAL
+            except Exception as exc:
+                logger.warning(f"Search index rebuild failed, retrying in {SEARCH_RETRY_INTERVAL}s: {exc}")
+                delay = SEARCH_RETRY_INTERVAL
+            await asyncio.sleep(delay)
+
+def start_search_refresh(tenant: Tenant, client: httpx.AsyncClient) -> None:
+    """
+    Starts the tenant's background index rebuild loop unless it is running.
+    It runs in a context of its own so no caller's deadline applies.
+    """
+    if tenant.search_refresh is None or tenant.search_refresh.done():
+        tenant.search_refresh = asyncio.get_running_loop().create_task(
+            _refresh_search_index(tenant, client), context=contextvars.Context()
+        )
+
+async def search_tickets(client: httpx.AsyncClient, args: SearchArgs) -> List[Dict[str, Any]]:
+    """
+    Ranks tickets against the query using the local index. The index is kept
+    current by every listing and write, and rebuilt from a full scan in the
+    background every EASYVISTA_SEARCH_REFRESH_INTERVAL; searches are served
+    from the current index meanwhile.
+    """
+    tenant = current_tenant()
+    start_search_refresh(tenant, client)
+    filters = {k: getattr(args, k) for k in ("status", "priority", "group_id", "assigned_to")}
+    return tenant.ticket_index.search(args.query, filters, args.limit)
+
+async def ticket_status_analytics(client: httpx.AsyncClient, args: StatusAnalyticsArgs) -> Dict[str, Any]:
+    """
+    Time-in-status statistics over the status histories of the filtered
+    tickets. Histories are fetched `concurrency` at a time while the ticket
+    list is still being paged, and folded into the totals as they arrive.
+    Those of closed tickets are kept per tenant and not fetched again.
+    """
+    fields = list(dict.fromkeys([*args.group_by, "rfc_number", "status"]))
+    filter_args = TicketFilterArgs(
+        **{**(args.filters or {}), "limit": args.page_size, "offset": 0, "fields": fields}
+    )
+    cache = current_tenant().closed_histories
+    analytics = StatusAnalytics(args.sla_seconds)
+    slots = asyncio.Semaphore(args.concurrency)
+    pending: set = set()
+    errors: List[Exception] = []
+    total = 0
+    fetched = 0
+
+    async def load(rfc_number: str, key: tuple) -> None:
+        nonlocal fetched
+        try:
+            history = await get_ticket_history(client, rfc_number)
+            fetched += 1
+            cache.put(rfc_number, history)
+            analytics.add(key, history)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            slots.release()
 
-async def generate_report(client: httpx.AsyncClient, args: ReportArgs) -> str:
-    filter_args = TicketFilterArgs(**(args.filters or {}))
-    tickets = await list_tickets(client, filter_args)
+    try:
+        async for ticket in iter_tickets(client, filter_args):
+            if errors:
+                raise errors[0]
+            total += 1
+            key = tuple(ticket.get(k) for k in args.group_by)
+            cached = cache.get(ticket["rfc_number"]) if is_terminal(ticket.get("status")) else None
+            if cached is not None:
+                analytics.add(key, cached)
+                continue
+            await slots.acquire()
+            task = asyncio.create_task(load(ticket["rfc_number"], key))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        await asyncio.gather(*pending)
+        if errors:
+            raise errors[0]
+    finally:
+        for task in list(pending):
+            task.cancel()
+
+    return {
+        "total": total,
+        "histories_fetched": fetched,
+        "groups": [
+            {**dict(zip(args.group_by, group.pop("group"))), **group}
+            for group in analytics.result()
+        ],
+    }
 
-    if args.report_type == "summary":
-        lines = [f"Ticket {t['rfc_number']}: {t['title']} ({t['status']})" for t in tickets]
-        return "\n".join(lines)
+async def _changed_since(
+    client: httpx.AsyncClient, filter_args: TicketFilterArgs, state: Dict[str, Any]
+) -> tuple:
+    """
+    Collects every matching ticket after the (updated_at, rfc_number)
+    position in `state`, returning them with the position of the last one.
+    Without keyset support upstream, all matching tickets are scanned by
+    offset and filtered here.
+    """
+    fields = filter_args.fields and list(dict.fromkeys([*filter_args.fields, *CURSOR_FIELDS]))
+    page_args = filter_args.copy(update={"cursor": encode_cursor(state), "fields": fields})
+    tickets: List[Dict[str, Any]] = []
+    if settings.EASYVISTA_SUPPORTS_KEYSET:
+        while True:
+            page = await _keyset_page(client, page_args)
+            tickets.extend(page["tickets"])
+            if not page["next_cursor"]:
+                break
+            page_args.cursor = page["next_cursor"]
+    else:
+        after = (_parse_timestamp(state["u"]), state["r"])
+        page_args.cursor = ""
+        while True:
+            page = await _offset_page(client, page_args)
+            tickets.extend(t for t in page["tickets"] if t.get("updated_at") and _cursor_key(t) > after)
+            if not page["next_cursor"]:
+                break
+            page_args.cursor = page["next_cursor"]
+        tickets.sort(key=_cursor_key)
+    if tickets:
+        state = {"u": tickets[-1].get("updated_at"), "r": tickets[-1].get("rfc_number")}
+    return tickets, state
 
-    if args.report_type == "csv":
-        import csv
-        from io import StringIO
-        output = StringIO()
-        writer = csv.DictWriter(output, fieldnames=["rfc_number", "title", "status", "priority", "category", "assigned_to"])
-        writer.writeheader()
-        for t in tickets:
-            writer.writerow({k: t.get(k, "") for k in writer.fieldnames})
-        return output.getvalue()
+async def generate_report(client: httpx.AsyncClient, args: ReportArgs) -> Any:
+    """
+    Renders a report over the filtered tickets. In delta mode (`since` or
+    `since_token`) only tickets changed after the watermark are included,
+    and the result also carries the new watermark and the token for the next run.
+    """
+    if args.report_type not in REPORT_COLUMNS:
+        raise ValueError(f"Unsupported report type: {args.report_type}")
+    columns = args.fields or REPORT_COLUMNS[args.report_type]
+    filter_args = TicketFilterArgs(**{**(args.filters or {}), "fields": columns})
 
-    if args.report_type == "html":
-        rows = "".join(f"<tr><td>{t.get('rfc_number', '')}</td><td>{t.get('title', '')}</td><td>{t.get('status', '')}</td></tr>" for t in tickets)
-        return f"<html><body><table border='1'><tr><th>RFC</th><th>Title</th><th>Status</th></tr>{rows}</table></body></html>"
+    if args.since is None and args.since_token is None:
+        tickets = await list_tickets(client, filter_args)
+        return await render(args.report_type, columns, tickets, custom=bool(args.fields))
 
-    raise ValueError(f"Unsupported report type: {args.report_type}")
+    if args.since_token:
+        state = decode_cursor(args.since_token)
+    else:
+        # The upstream stores naive UTC timestamps; send `since` in that form.
+        since = _parse_timestamp(args.since).astimezone(timezone.utc).replace(tzinfo=None)
+        state = {"u": since.isoformat(), "r": ""}
+    tickets, state = await _changed_since(client, filter_args, state)
+    return {
+        "report": await render(args.report_type, columns, tickets, custom=bool(args.fields)),
+        "changed": len(tickets),
+        "watermark": state["u"],
+        "next_token": encode_cursor(state),
+    }
 
 async def dispatch(client: httpx.AsyncClient, method: str, args: Dict[str, Any]) -> Any:
     if method == "create_ticket":
@@ -168,7 +670,8 @@ async def dispatch(client: httpx.AsyncClient, method: str, args: Dict[str, Any])
     if method == "close_ticket":
         return await close_ticket(client, CloseTicketArgs(**args))
     if method == "get_ticket":
-        return await get_ticket(client, args["rfc_number"])
+        ticket_args = GetTicketArgs(**args)
+        return await get_ticket(client, ticket_args.rfc_number, ticket_args.fields)
     if method == "get_ticket_history":
         return await get_ticket_history(client, args["rfc_number"])
     if method == "list_tickets":
@@ -181,6 +684,12 @@ async def dispatch(client: httpx.AsyncClient, method: str, args: Dict[str, Any])
         return await list_tickets(client, TicketFilterArgs(priority=args["priority"]))
     if method == "generate_report":
         return await generate_report(client, ReportArgs(**args))
+    if method == "search_tickets":
+        return await search_tickets(client, SearchArgs(**args))
+    if method == "ticket_status_analytics":
+        return await ticket_status_analytics(client, StatusAnalyticsArgs(**args))
+    if method == "aggregate_tickets":
+        return await aggregate_tickets(client, AggregateArgs(**args))
     if method == "get_resolution_metrics":
         return await get_resolution_metrics(client)
     
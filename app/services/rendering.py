@@ -0,0 +1,69 @@
+# app/services/rendering.py
+"""
+Report rendering. Small reports are formatted inline. Reports with at least
+REPORT_RENDER_INLINE_ROWS rows are formatted on a bounded worker pool, so a
+large export does not hold up other requests on the event loop.
+"""
+import asyncio
+import csv
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from io import StringIO
+from typing import Any, Dict, List
+
+from app.core.config import settings
+
+_executor: Executor | None = None
+
+def render_report(report_type: str, columns: List[str], tickets: List[Dict[str, Any]], custom: bool = False) -> str:
+    """
+    Formats tickets as a summary, csv or html report with the given columns.
+    """
+    if report_type == "summary":
+        if custom:
+            lines = [" | ".join(str(t.get(k, "")) for k in columns) for t in tickets]
+        else:
+            lines = [f"Ticket {t['rfc_number']}: {t['title']} ({t['status']})" for t in tickets]
+        return "\n".join(lines)
+
+    if report_type == "csv":
+        output = StringIO()
+        writer = csv.DictWriter(output, fieldnames=columns)
+        writer.writeheader()
+        for t in tickets:
+            writer.writerow({k: t.get(k, "") for k in writer.fieldnames})
+        return output.getvalue()
+
+    labels = {"rfc_number": "RFC", "title": "Title", "status": "Status"}
+    head = "".join(f"<th>{labels.get(k, k)}</th>" for k in columns)
+    rows = "".join("<tr>" + "".join(f"<td>{t.get(k, '')}</td>" for k in columns) + "</tr>" for t in tickets)
+    return f"<html><body><table border='1'><tr>{head}</tr>{rows}</table></body></html>"
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        workers = settings.REPORT_RENDER_WORKERS
+        if settings.REPORT_RENDER_POOL == "process":
+            # Spawned, not forked: the parent runs the log and capture threads.
+            _executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            _executor = ThreadPoolExecutor(workers, thread_name_prefix="report-render")
+    return _executor
+
+async def render(report_type: str, columns: List[str], tickets: List[Dict[str, Any]], custom: bool = False) -> str:
+    """
+    Renders a report, on the worker pool when it has at least
+    REPORT_RENDER_INLINE_ROWS rows. The pool has REPORT_RENDER_WORKERS
+    workers, so at most that many large reports are formatted at once.
+    """
+    if len(tickets) < settings.REPORT_RENDER_INLINE_ROWS:
+        return render_report(report_type, columns, tickets, custom)
+    job = partial(render_report, report_type, columns, tickets, custom)
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), job)
+
+def shutdown_render_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,70 @@
+# app/services/revalidation.py
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, Tuple
+
+import httpx
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+class RevalidationCache:
+    """
+    Bounded LRU store of upstream GET bodies and their validators, used to
+    turn repeat reads into conditional requests.
+
+    Validators come from the `ETag` and `Last-Modified` response headers or,
+    when the upstream sends neither, from the ticket's `updated_at` field.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[CacheKey, Tuple[Dict[str, str], Any]]" = OrderedDict()
+        self.hits = 0
+
+    @staticmethod
+    def key(url: str, params: Dict[str, Any] | None) -> CacheKey:
+        return url, tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+
+    def lookup(self, key: CacheKey) -> Tuple[Dict[str, str], Any] | None:
+        """
+        Returns the conditional request headers and stored body for a key.
+        """
+        return self.entries.get(key)
+
+    def store(self, key: CacheKey, resp: httpx.Response, body: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        validators = {}
+        if resp.headers.get("ETag"):
+            validators["If-None-Match"] = resp.headers["ETag"]
+        if resp.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = resp.headers["Last-Modified"]
+        elif isinstance(body, dict) and body.get("updated_at"):
+            updated_at = datetime.fromisoformat(body["updated_at"].replace("Z", "+00:00"))
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            validators["If-Modified-Since"] = format_datetime(updated_at, usegmt=True)
+        if not validators:
+            self.entries.pop(key, None)
+            return
+        self.entries[key] = (validators, body)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, *urls: str) -> None:
+        """
+        Drops every stored entry for the given URLs, whatever their params.
+        """
+        for key in [key for key in self.entries if key[0] in urls]:
+            del self.entries[key]
+
+    def not_modified(self, key: CacheKey, body: Any) -> Any:
+        """
+        Records a 304 answer and returns the stored body.
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+        self.hits += 1
+        return body
@@ -0,0 +1,177 @@
+# app/services/scheduling.py
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterator
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+BULK = "bulk"
+
+# Relative share of upstream slots each lane gets when all of them are busy.
+LANE_WEIGHTS = {INTERACTIVE: 8, BACKGROUND: 3, BULK: 1}
+
+# Lane of each RPC method; methods not listed are interactive.
+METHOD_LANES = {
+    "list_tickets": BACKGROUND,
+    "get_tickets_by_group": BACKGROUND,
+    "get_tickets_by_status": BACKGROUND,
+    "get_tickets_by_priority": BACKGROUND,
+    "get_resolution_metrics": BACKGROUND,
+    "aggregate_tickets": BULK,
+    "generate_report": BULK,
+    "ticket_status_analytics": BULK,
+}
+
+_current_lane: ContextVar[str] = ContextVar("lane", default=BACKGROUND)
+
+def classify(method: str, hint: str | None = None) -> str:
+    """
+    Lane for an RPC call: the client's hint when it names a lane, otherwise
+    the method's default.
+    """
+    if hint is not None:
+        if hint not in LANE_WEIGHTS:
+            raise ValueError(f"Unknown priority lane: {hint}")
+        return hint
+    return METHOD_LANES.get(method, INTERACTIVE)
+
+@contextmanager
+def lane_scope(lane: str) -> Iterator[None]:
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+def current_lane() -> str:
+    return _current_lane.get()
+
+class _LaneStats:
+    def __init__(self, window: int = 1000):
+        self.granted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent: deque = deque(maxlen=window)
+
+    def add(self, wait: float) -> None:
+        self.granted += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.recent.append(wait)
+
+    def snapshot(self, queued: int) -> Dict[str, Any]:
+        ordered = sorted(self.recent)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] if ordered else 0.0
+        return {
+            "queued": queued,
+            "granted": self.granted,
+            "avg_wait_ms": round(1000 * self.total_wait / self.granted, 2) if self.granted else 0.0,
+            "p95_wait_ms": round(1000 * p95, 2),
+            "max_wait_ms": round(1000 * self.max_wait, 2),
+        }
+
+class LaneScheduler:
+    """
+    Weighted fair queueing of upstream calls across priority lanes.
+
+    At most `capacity` calls run at once. Waiting calls are served in order
+    of virtual start time (start-time fair queueing), so busy lanes share
+    slots in proportion to their weights. Background and bulk calls can
+    never hold the last `reserved` slots, which keeps room for interactive
+    lookups during heavy exports.
+    """
+
+    def __init__(self, capacity: int, reserved: int = 1, weights: Dict[str, int] = LANE_WEIGHTS):
+        self.capacity = capacity
+        self.reserved = min(reserved, capacity - 1)
+        self.weights = weights
+        self.in_use = 0
+        self.in_use_interactive = 0
+        self.vtime = 0.0
+        self.last_finish = {lane: 0.0 for lane in weights}
+        self.queues: Dict[str, deque] = {lane: deque() for lane in weights}
+        self.stats = {lane: _LaneStats() for lane in weights}
+
+    def _can_run(self, lane: str) -> bool:
+        if self.in_use >= self.capacity:
+            return False
+        if lane == INTERACTIVE:
+            return True
+        return self.in_use - self.in_use_interactive < self.capacity - self.reserved
+
+    def _grant(self, lane: str) -> None:
+        self.in_use += 1
+        if lane == INTERACTIVE:
+            self.in_use_interactive += 1
+
+    def _release(self, lane: str) -> None:
+        self.in_use -= 1
+        if lane == INTERACTIVE:
+            self.in_use_interactive -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while True:
+            heads = [
+                (queue[0][0], lane) for lane, queue in self.queues.items()
+                if queue and self._can_run(lane)
+            ]
+            if not heads:
+                return
+            start, lane = min(heads)
+            _, future = self.queues[lane].popleft()
+            self._grant(lane)
+            self.vtime = max(self.vtime, start)
+            future.set_result(None)
+
+    def try_acquire(self, lane: str) -> bool:
+        """
+        Takes a slot only if one is free now and no call is waiting for one;
+        pair with release(). Used for optional extra work such as hedges.
+        """
+        if any(self.queues.values()) or not self._can_run(lane):
+            return False
+        self._grant(lane)
+        return True
+
+    def release(self, lane: str) -> None:
+        self._release(lane)
+
+    @asynccontextmanager
+    async def slot(self, lane: str) -> AsyncIterator[None]:
+        start = max(self.vtime, self.last_finish[lane])
+        self.last_finish[lane] = start + 1.0 / self.weights[lane]
+        queued_at = time.monotonic()
+        if not self.queues[lane] and self._can_run(lane):
+            self._grant(lane)
+            self.vtime = max(self.vtime, start)
+        else:
+            entry = (start, asyncio.get_running_loop().create_future())
+            self.queues[lane].append(entry)
+            try:
+                await entry[1]
+            except asyncio.CancelledError:
+                if entry[1].done() and not entry[1].cancelled():
+                    # The slot was granted just as the caller gave up.
+                    self._release(lane)
+                else:
+                    self.queues[lane].remove(entry)
+                raise
+        self.stats[lane].add(time.monotonic() - queued_at)
+        try:
+            yield
+        finally:
+            self._release(lane)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "lanes": {
+                lane: self.stats[lane].snapshot(len(self.queues[lane]))
+                for lane in self.weights
+            },
+        }
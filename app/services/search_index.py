@@ -0,0 +1,103 @@
+# app/services/search_index.py
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List
+
+# Ticket fields kept alongside each indexed document for filtering and display.
+STORED_FIELDS = ("rfc_number", "title", "status", "priority", "group_id", "assigned_to")
+TEXT_FIELDS = ("title", "description")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+class TicketSearchIndex:
+    """
+    Incrementally maintained inverted index over ticket titles and descriptions,
+    ranked with BM25.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.doc_texts: Dict[str, Dict[str, str]] = {}
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.total_length = 0
+        # time.monotonic() at the start of the full scan that built this
+        # index; None while it only holds the tickets seen so far.
+        self.loaded_at: float | None = None
+        # Index being rebuilt from a full scan; it receives every upsert made
+        # here until it is swapped in.
+        self.shadow: "TicketSearchIndex | None" = None
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def upsert(self, ticket: Dict[str, Any]) -> None:
+        """
+        Adds or refreshes a ticket. Partial tickets (e.g. from a field
+        projection) only update the fields they carry.
+        """
+        if self.shadow is not None:
+            self.shadow.upsert(ticket)
+        rfc_number = ticket.get("rfc_number")
+        if not rfc_number:
+            return
+        doc = self.docs.setdefault(rfc_number, {"rfc_number": rfc_number})
+        doc.update({k: ticket[k] for k in STORED_FIELDS if k in ticket})
+
+        texts = self.doc_texts.setdefault(rfc_number, {})
+        changed = {k: ticket[k] or "" for k in TEXT_FIELDS if k in ticket and ticket[k] != texts.get(k)}
+        if not changed and rfc_number in self.doc_lengths:
+            return
+        self._remove_terms(rfc_number, texts)
+        texts.update(changed)
+        terms = Counter(tokenize(" ".join(texts.get(k, "") for k in TEXT_FIELDS)))
+        for term, freq in terms.items():
+            self.postings.setdefault(term, {})[rfc_number] = freq
+        length = sum(terms.values())
+        self.doc_lengths[rfc_number] = length
+        self.total_length += length
+
+    def upsert_many(self, tickets: List[Dict[str, Any]]) -> None:
+        for ticket in tickets:
+            self.upsert(ticket)
+
+    def _remove_terms(self, rfc_number: str, texts: Dict[str, str]) -> None:
+        if rfc_number not in self.doc_lengths:
+            return
+        self.total_length -= self.doc_lengths.pop(rfc_number)
+        for term in set(tokenize(" ".join(texts.get(k, "") for k in TEXT_FIELDS))):
+            docs = self.postings.get(term, {})
+            docs.pop(rfc_number, None)
+            if not docs:
+                self.postings.pop(term, None)
+
+    def search(self, query: str, filters: Dict[str, Any] | None = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Returns up to `limit` stored tickets matching any query term and all
+        filters, best BM25 score first.
+        """
+        filters = {k: v for k, v in (filters or {}).items() if v}
+        n_docs = len(self.doc_lengths)
+        if not n_docs:
+            return []
+        avg_length = self.total_length / n_docs or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for rfc_number, freq in docs.items():
+                doc = self.docs[rfc_number]
+                if any(doc.get(k) != v for k, v in filters.items()):
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[rfc_number] / avg_length)
+                scores[rfc_number] = scores.get(rfc_number, 0.0) + idf * freq * (self.k1 + 1) / (freq + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [{**self.docs[rfc_number], "score": round(score, 4)} for rfc_number, score in ranked]
@@ -0,0 +1,133 @@
+# app/services/status_analytics.py
+from collections import Counter, OrderedDict, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+# Statuses a ticket does not leave, lower-cased: the upstream writes both
+# "Closed" and "closed". Time spent in them is not measured.
+TERMINAL_STATUSES = frozenset({"closed"})
+
+History = List[Dict[str, Any]]
+
+def is_terminal(status: Any) -> bool:
+    return isinstance(status, str) and status.lower() in TERMINAL_STATUSES
+
+def _timestamp(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+class ClosedHistoryCache:
+    """
+    Bounded LRU store of status histories of closed tickets, which no longer
+    change and so never need to be fetched again.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, History]" = OrderedDict()
+        self.hits = 0
+
+    def get(self, rfc_number: str) -> History | None:
+        history = self.entries.get(rfc_number)
+        if history is not None:
+            self.entries.move_to_end(rfc_number)
+            self.hits += 1
+        return history
+
+    def put(self, rfc_number: str, history: History) -> None:
+        if self.max_entries <= 0 or not history:
+            return
+        if not is_terminal(history[-1].get("status")):
+            return
+        self.entries[rfc_number] = history
+        self.entries.move_to_end(rfc_number)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+def _distribution(durations: List[float]) -> Dict[str, float]:
+    ordered = sorted(durations)
+    n = len(ordered)
+    return {
+        "count": n,
+        "avg": sum(ordered) / n,
+        "p50": ordered[min(n - 1, int(0.50 * n))],
+        "p90": ordered[min(n - 1, int(0.90 * n))],
+        "max": ordered[-1],
+    }
+
+class _GroupStats:
+    def __init__(self):
+        self.tickets = 0
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+        self.transitions: Counter = Counter()
+        self.entered: Counter = Counter()
+        self.breached: Counter = Counter()
+
+class StatusAnalytics:
+    """
+    Time-in-status distributions, transition counts and SLA-breach rates per
+    group. Histories are folded in one at a time with add(), so only the
+    per-group accumulators are kept in memory.
+
+    Distributions cover finished stays only. A ticket breaches the SLA of a
+    status when any stay in it, including the current one, lasted longer than
+    the limit; the rate is over the tickets that entered that status.
+    """
+
+    def __init__(self, sla_seconds: Dict[str, float], now: datetime | None = None):
+        self.sla_seconds = sla_seconds
+        self.now = now or datetime.now(timezone.utc)
+        self.groups: Dict[Tuple, _GroupStats] = defaultdict(_GroupStats)
+
+    def add(self, key: Tuple, history: History) -> None:
+        stats = self.groups[key]
+        stats.tickets += 1
+        changes = sorted(
+            ((_timestamp(h["changed_at"]), h["status"]) for h in history if h.get("changed_at")),
+            key=lambda change: change[0],
+        )
+        # Consecutive entries with the same status are one stay.
+        stays: List[Tuple[datetime, str]] = []
+        for at, status in changes:
+            if not stays or stays[-1][1] != status:
+                stays.append((at, status))
+
+        entered = set()
+        breached = set()
+        for i, (at, status) in enumerate(stays):
+            entered.add(status)
+            if i + 1 < len(stays):
+                seconds = (stays[i + 1][0] - at).total_seconds()
+                stats.durations[status].append(seconds)
+                stats.transitions[(status, stays[i + 1][1])] += 1
+            elif is_terminal(status):
+                continue
+            else:
+                seconds = (self.now - at).total_seconds()
+            limit = self.sla_seconds.get(status)
+            if limit is not None and seconds > limit:
+                breached.add(status)
+        stats.entered.update(entered)
+        stats.breached.update(breached)
+
+    def result(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "group": key,
+                "tickets": stats.tickets,
+                "time_in_status": {
+                    status: _distribution(durations) for status, durations in sorted(stats.durations.items())
+                },
+                "transitions": [
+                    {"from": source, "to": target, "count": count}
+                    for (source, target), count in stats.transitions.most_common()
+                ],
+                "sla_breach_rate": {
+                    status: stats.breached[status] / stats.entered[status]
+                    for status in self.sla_seconds if stats.entered[status]
+                },
+            }
+            for key, stats in sorted(self.groups.items(), key=lambda item: -item[1].tickets)
+        ]
@@ -0,0 +1,220 @@
+# app/services/tenants.py
+import asyncio
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import httpx
+
+from app.core.config import TenantConfig, settings
+from app.services.coalescing import WriteCoalescer
+from app.services.hedging import Hedger
+from app.services.revalidation import RevalidationCache
+from app.services.scheduling import LaneScheduler
+from app.services.search_index import TicketSearchIndex
+from app.services.status_analytics import ClosedHistoryCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT = "default"
+# Seconds between checks of the tenants file, and how long a replaced
+# tenant's connection pool stays open for requests still using it.
+RELOAD_INTERVAL = 1.0
+RETIRE_GRACE = 60.0
+
+class Tenant:
+    """
+    Upstream connection settings and isolated per-account state: connection
+    pool, upstream call scheduler and caches, so one tenant cannot starve
+    another.
+    """
+
+    def __init__(self, name: str, config: TenantConfig):
+        self.name = name
+        self.config = config
+        self.upstream = {
+            "url": str(config.url).rstrip("/"),
+            "key": config.api_key,
+            "account": config.account_id,
+            "read_headers": {
+                "Authorization": f"Bearer {config.api_key}",
+                "Accept": "application/json",
+            },
+            "write_headers": {
+                "Authorization": f"Bearer {config.api_key}",
+                "Content-Type": "application/json",
+            },
+        }
+        self._client: httpx.AsyncClient | None = None
+        self.scheduler = LaneScheduler(config.max_concurrency, config.interactive_reserved)
+        self.ticket_index = TicketSearchIndex()
+        # Background task that periodically rebuilds ticket_index.
+        self.search_refresh: asyncio.Task | None = None
+        self.revalidation_cache = RevalidationCache(settings.EASYVISTA_REVALIDATION_CACHE_SIZE)
+        self.closed_histories = ClosedHistoryCache(settings.EASYVISTA_HISTORY_CACHE_SIZE)
+        self.update_coalescer = WriteCoalescer(settings.EASYVISTA_COALESCE_WINDOW)
+        self.hedger = Hedger(
+            percentile=settings.EASYVISTA_HEDGE_PERCENTILE,
+            budget=settings.EASYVISTA_HEDGE_BUDGET,
+            min_delay=settings.EASYVISTA_HEDGE_MIN_DELAY,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_connections,
+            )
+            self._client = httpx.AsyncClient(timeout=30, limits=limits)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self.search_refresh is not None:
+            self.search_refresh.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+
+def default_config() -> TenantConfig:
+    return TenantConfig(
+        tool_api_key=settings.EASYVISTA_TOOL_API_KEY,
+        url=settings.EASYVISTA_URL,
+        api_key=settings.EASYVISTA_API_KEY,
+        account_id=settings.EASYVISTA_ACCOUNT_ID,
+        max_connections=settings.EASYVISTA_MAX_CONNECTIONS,
+        max_concurrency=settings.EASYVISTA_MAX_CONCURRENCY,
+        interactive_reserved=settings.EASYVISTA_INTERACTIVE_RESERVED,
+    )
+
+class TenantRegistry:
+    """
+    Maps tool API keys to tenants: the default tenant from the EASYVISTA_*
+    settings plus any listed in EASYVISTA_TENANTS_FILE. watch() reloads the
+    file when its modification time changes.
+    """
+
+    def __init__(self):
+        self.default = Tenant(DEFAULT_TENANT, default_config())
+        self.tenants: Dict[str, Tenant] = {}
+        self._by_key: Dict[str, Tenant] = {}
+        self._mtime: float | None = None
+        self._retiring: Dict[asyncio.Task, Tenant] = {}
+        self._index()
+        self.reload_if_changed()
+
+    def _index(self) -> None:
+        by_key = {self.default.config.tool_api_key: self.default}
+        for tenant in self.tenants.values():
+            by_key[tenant.config.tool_api_key] = tenant
+        self._by_key = by_key
+
+    def _read(self, path: Path) -> Tuple[float, Dict[str, TenantConfig]] | None:
+        """
+        Parses the tenants file if it changed since the last load. Blocking;
+        watch() runs it in a worker thread.
+        """
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            logger.warning(f"Tenants file {path} is not readable; keeping current tenants.")
+            return None
+        if mtime == self._mtime:
+            return None
+        try:
+            raw = json.loads(path.read_text())
+            configs = {name: TenantConfig(**cfg) for name, cfg in raw.items()}
+            owners = {self.default.config.tool_api_key: DEFAULT_TENANT}
+            for name, config in configs.items():
+                other = owners.setdefault(config.tool_api_key, name)
+                if other != name:
+                    raise ValueError(f"tenants {other} and {name} share a tool_api_key")
+        except Exception as exc:
+            # Remember the file anyway so the error is logged once per change.
+            self._mtime = mtime
+            logger.error(f"Invalid tenants file {path}, keeping current tenants: {exc}")
+            return None
+        return mtime, configs
+
+    def _apply(self, path: Path, mtime: float, configs: Dict[str, TenantConfig]) -> None:
+        self._mtime = mtime
+        tenants = {}
+        for name, config in configs.items():
+            current = self.tenants.get(name)
+            tenants[name] = current if current and current.config == config else Tenant(name, config)
+        for name, tenant in self.tenants.items():
+            if tenants.get(name) is not tenant:
+                self._retire(tenant)
+        self.tenants = tenants
+        self._index()
+        logger.info(f"Loaded {len(tenants)} tenant(s) from {path}.")
+
+    def reload_if_changed(self) -> None:
+        path = settings.EASYVISTA_TENANTS_FILE
+        if path is None:
+            return
+        loaded = self._read(path)
+        if loaded is not None:
+            self._apply(path, *loaded)
+
+    async def watch(self) -> None:
+        """
+        Checks the tenants file every RELOAD_INTERVAL seconds, off the event
+        loop, until cancelled.
+        """
+        while True:
+            await asyncio.sleep(RELOAD_INTERVAL)
+            path = settings.EASYVISTA_TENANTS_FILE
+            if path is None:
+                continue
+            loaded = await asyncio.to_thread(self._read, path)
+            if loaded is not None:
+                self._apply(path, *loaded)
+
+    def _retire(self, tenant: Tenant) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._close_later(tenant))
+        self._retiring[task] = tenant
+        task.add_done_callback(lambda t: self._retiring.pop(t, None))
+
+    async def _close_later(self, tenant: Tenant) -> None:
+        await asyncio.sleep(RETIRE_GRACE)
+        await tenant.aclose()
+
+    def resolve(self, tool_api_key: str | None) -> Tenant | None:
+        if not tool_api_key:
+            return None
+        return self._by_key.get(tool_api_key)
+
+    def all(self) -> List[Tenant]:
+        return [self.default, *self.tenants.values()]
+
+    async def aclose(self) -> None:
+        retiring = list(self._retiring.items())
+        for task, _ in retiring:
+            task.cancel()
+        for tenant in [self.default, *self.tenants.values(), *(t for _, t in retiring)]:
+            await tenant.aclose()
+
+tenant_registry = TenantRegistry()
+
+_current_tenant: ContextVar[Tenant | None] = ContextVar("tenant", default=None)
+
+def current_tenant() -> Tenant:
+    """
+    The tenant of the JSON-RPC call being served, or the default tenant.
+    """
+    return _current_tenant.get() or tenant_registry.default
+
+@contextmanager
+def tenant_scope(tenant: Tenant) -> Iterator[None]:
+    token = _current_tenant.set(tenant)
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
@@ -0,0 +1,61 @@
+# app/services/warmup.py
+import asyncio
+import logging
+
+import httpx
+
+from app.core.config import settings
+from app.models.reporting import TicketFilterArgs
+from app.services.mcp_easyvista_tools import list_tickets
+from app.services.tenants import Tenant, tenant_registry, tenant_scope
+
+logger = logging.getLogger(__name__)
+
+# Seconds between warm-up attempts while the upstream is unreachable.
+RETRY_INTERVAL = 5.0
+
+async def warm_up_tenant(tenant: Tenant, client: httpx.AsyncClient) -> None:
+    """
+    Opens pooled upstream connections (paying for DNS and TLS up front) and
+    optionally prefetches open tickets into the tenant's search index. The
+    connection probes themselves are kept out of the index.
+    """
+    with tenant_scope(tenant):
+        probes = [
+            list_tickets(client, TicketFilterArgs(limit=1, fields=["rfc_number"]), index=False)
+            for _ in range(max(1, settings.WARMUP_CONNECTIONS))
+        ]
+        await asyncio.gather(*probes)
+        if settings.WARMUP_PREFETCH:
+            await list_tickets(client, TicketFilterArgs(status="Open", limit=100))
+
+async def _warm_up_until_done(tenant: Tenant, client: httpx.AsyncClient) -> None:
+    while True:
+        try:
+            await warm_up_tenant(tenant, client)
+            logger.info(f"Tenant {tenant.name} warmed up.")
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning(f"Warm-up of tenant {tenant.name} failed, retrying in {RETRY_INTERVAL}s: {exc}")
+            await asyncio.sleep(RETRY_INTERVAL)
+
+async def warm_up(app) -> None:
+    """
+    Warms every tenant independently, each retrying until its upstream
+    answers. The application is marked ready once the default tenant is
+    warm, so an unreachable secondary tenant cannot hold up readiness.
+    """
+    others = [
+        asyncio.create_task(_warm_up_until_done(tenant, tenant.client))
+        for tenant in tenant_registry.all() if tenant is not tenant_registry.default
+    ]
+    try:
+        await _warm_up_until_done(tenant_registry.default, app.state.http_client)
+        app.state.ready = True
+        logger.info("Warm-up complete, service is ready.")
+        await asyncio.gather(*others, return_exceptions=True)
+    finally:
+        for task in others:
+            task.cancel()
@@ -1,14 +1,29 @@
 # mock_api/main.py
+import hashlib
+import json
 import logging
-from fastapi import FastAPI, HTTPException, Request
+import os
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import FastAPI, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 app = FastAPI()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# --- Replay Mode ---
+# Serve responses recorded from a real EasyVista instance instead of the sample data.
+if os.getenv("MOCK_REPLAY_FILE"):
+    from replay import ReplayStore
+
+    replay_store = ReplayStore(os.environ["MOCK_REPLAY_FILE"], float(os.getenv("MOCK_REPLAY_SPEED", "1")))
+
+    @app.middleware("http")
+    async def replay_recorded(request: Request, call_next):
+        return await replay_store.serve(request)
+
 # --- Enhanced Sample Data ---
 now = datetime.utcnow()
 tickets = {
@@ -37,6 +52,31 @@ ticket_status_history = {
     ],
 }
 
+def project(ticket: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    if not fields:
+        return ticket
+    return {k: ticket[k] for k in fields.split(",") if k in ticket}
+
+def conditional(request: Request, body: Any, updated_at: Optional[str]) -> Any:
+    """
+    Answers 304 when the client's ETag or If-Modified-Since is still current,
+    otherwise returns the body with fresh validators.
+    """
+    etag = '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest() + '"'
+    headers = {"ETag": etag}
+    if updated_at:
+        headers["Last-Modified"] = format_datetime(datetime.fromisoformat(updated_at).replace(microsecond=0, tzinfo=timezone.utc), usegmt=True)
+    if_none_match = request.headers.get("If-None-Match")
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_none_match is not None:
+        if if_none_match == etag:
+            return Response(status_code=304, headers=headers)
+    elif if_modified_since and updated_at:
+        modified = datetime.fromisoformat(updated_at).replace(microsecond=0, tzinfo=timezone.utc)
+        if modified <= parsedate_to_datetime(if_modified_since):
+            return Response(status_code=304, headers=headers)
+    return Response(content=json.dumps(body), media_type="application/json", headers=headers)
+
 class Ticket(BaseModel):
     title: str
     description: str
@@ -47,8 +87,8 @@ class Ticket(BaseModel):
     assigned_to: Optional[str] = None
 
 @app.post("/api/v1/tickets", status_code=201)
-async def create_ticket(ticket: Ticket, request: Request):
-    logger.info(f"Received request to create ticket: {await request.json()}")
+async def create_ticket(ticket: Ticket):
+    logger.info("Received request to create ticket")
     rfc_number = f"RFC{len(tickets) + 200}" # Increment to avoid collision
     creation_time = datetime.utcnow()
     new_ticket = {
@@ -65,12 +105,12 @@ async def create_ticket(ticket: Ticket, request: Request):
     }
     tickets[rfc_number] = new_ticket
     ticket_status_history[rfc_number] = [{"status": "Open", "changed_at": creation_time.isoformat()}]
-    logger.info(f"Created new ticket: {new_ticket}")
+    logger.info("Created new ticket %s", rfc_number)
     return new_ticket
 
 @app.put("/api/v1/tickets/{rfc_number}")
-async def update_ticket(rfc_number: str, params: Dict[str, Any], request: Request):
-    logger.info(f"Received request to update ticket {rfc_number} with params: {await request.json()}")
+async def update_ticket(rfc_number: str, params: Dict[str, Any]):
+    logger.info("Received request to update ticket %s fields %s", rfc_number, sorted(params))
     if rfc_number not in tickets:
         logger.warning(f"Ticket not found: {rfc_number}. Returning default ticket RFC123.")
         rfc_number = "RFC123" # Default to a known ticket
@@ -88,12 +128,12 @@ async def update_ticket(rfc_number: str, params: Dict[str, Any], request: Reques
             resolution_time = datetime.utcnow() - created_at
             tickets[rfc_number]["resolution_time_seconds"] = resolution_time.total_seconds()
 
-    logger.info(f"Updated ticket {rfc_number}: {tickets[rfc_number]}")
+    logger.info("Updated ticket %s", rfc_number)
     return tickets[rfc_number]
 
 @app.put("/api/v1/tickets/{rfc_number}/close")
-async def close_ticket(rfc_number: str, comment: str, request: Request):
-    logger.info(f"Received request to close ticket {rfc_number} with comment: {await request.json()}")
+async def close_ticket(rfc_number: str, comment: str):
+    logger.info("Received request to close ticket %s", rfc_number)
     if rfc_number not in tickets:
         logger.warning(f"Ticket not found: {rfc_number}. Returning default ticket RFC123.")
         rfc_number = "RFC123" # Default to a known ticket
@@ -108,16 +148,16 @@ async def close_ticket(rfc_number: str, comment: str, request: Request):
     tickets[rfc_number]["resolution_time_seconds"] = resolution_time.total_seconds()
     
     ticket_status_history.setdefault(rfc_number, []).append({"status": "Closed", "changed_at": now_iso})
-    logger.info(f"Closed ticket {rfc_number}: {tickets[rfc_number]}")
+    logger.info("Closed ticket %s", rfc_number)
     return tickets[rfc_number]
 
 @app.get("/api/v1/tickets/{rfc_number}/history")
-async def get_ticket_history(rfc_number: str):
-    logger.info(f"Request received for ticket history: {rfc_number}")
+async def get_ticket_history(rfc_number: str, request: Request):
+    logger.info("Request received for ticket history: %s", rfc_number)
     if rfc_number not in ticket_status_history:
         logger.warning(f"History not found for ticket: {rfc_number}. Returning history for default ticket RFC123.")
         rfc_number = "RFC123" # Default to a known ticket
-    return ticket_status_history[rfc_number]
+    return conditional(request, ticket_status_history[rfc_number], tickets.get(rfc_number, {}).get("updated_at"))
 
 @app.get("/api/v1/metrics/resolution")
 async def get_resolution_metrics():
@@ -137,8 +177,8 @@ async def get_resolution_metrics():
 
 # --- Existing Endpoints (Updated) ---
 @app.get("/api/v1/tickets")
-async def list_tickets(status: str = None, priority: str = None, group_id: str = None, assigned_to: str = None, limit: int = 20, offset: int = 0):
-    logger.info(f"Listing tickets with filters: status={status}, priority={priority}, group_id={group_id}, assigned_to={assigned_to}")
+async def list_tickets(status: str = None, priority: str = None, group_id: str = None, assigned_to: str = None, limit: int = 20, offset: int = 0, fields: str = None, sort: str = None, updated_since: str = None, cursor: str = None):
+    logger.info("Listing tickets with filters: status=%s, priority=%s, group_id=%s, assigned_to=%s", status, priority, group_id, assigned_to)
     filtered_tickets = list(tickets.values())
     if status:
         filtered_tickets = [t for t in filtered_tickets if t.get("status") == status]
@@ -148,14 +188,32 @@ async def list_tickets(status: str = None, priority: str = None, group_id: str =
         filtered_tickets = [t for t in filtered_tickets if t.get("group_id") == group_id]
     if assigned_to:
         filtered_tickets = [t for t in filtered_tickets if t.get("assigned_to") == assigned_to]
-    logger.info(f"Found {len(filtered_tickets)} tickets matching criteria.")
-    return {"tickets": filtered_tickets[offset:offset+limit]}
+    if updated_since:
+        since = datetime.fromisoformat(updated_since.replace("Z", "+00:00"))
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        filtered_tickets = [t for t in filtered_tickets if datetime.fromisoformat(t["updated_at"]) >= since]
+    if sort or cursor is not None:
+        keys = (sort or "updated_at,rfc_number").split(",")
+        filtered_tickets.sort(key=lambda t: tuple(str(t.get(k, "")) if k != "updated_at" else datetime.fromisoformat(t[k]) for k in keys))
+    logger.info("Found %d tickets matching criteria.", len(filtered_tickets))
+
+    # Native keyset pagination: the cursor is the (updated_at, rfc_number) of the last ticket served.
+    if cursor is not None:
+        if cursor:
+            after_updated, after_rfc = cursor.split("|", 1)
+            after = (datetime.fromisoformat(after_updated), after_rfc)
+            filtered_tickets = [t for t in filtered_tickets if (datetime.fromisoformat(t["updated_at"]), t["rfc_number"]) > after]
+        page = filtered_tickets[:limit]
+        next_cursor = f"{page[-1]['updated_at']}|{page[-1]['rfc_number']}" if len(filtered_tickets) > limit else None
+        return {"tickets": [project(t, fields) for t in page], "next_cursor": next_cursor}
+    return {"tickets": [project(t, fields) for t in filtered_tickets[offset:offset+limit]]}
 
 @app.get("/api/v1/tickets/{rfc_number}")
-async def get_ticket(rfc_number: str):
-    logger.info(f"Request received for ticket: {rfc_number}")
+async def get_ticket(rfc_number: str, request: Request, fields: str = None):
+    logger.info("Request received for ticket: %s", rfc_number)
     if rfc_number not in tickets:
         logger.warning(f"Ticket not found: {rfc_number}. Returning default ticket RFC123.")
-        return tickets["RFC123"]
-    logger.info(f"Returning ticket: {tickets[rfc_number]}")
-    return tickets[rfc_number]
+        rfc_number = "RFC123"
+    logger.info("Returning ticket %s", rfc_number)
+    return conditional(request, project(tickets[rfc_number], fields), tickets[rfc_number].get("updated_at"))
@@ -0,0 +1,83 @@
+# mock_api/replay.py
+"""
+Replay mode for the mock API: serves upstream responses recorded by the
+service's traffic capture (CAPTURE_FILE), with their original latency.
+
+Enable it with MOCK_REPLAY_FILE=<capture file>. MOCK_REPLAY_SPEED divides
+the recorded latencies (2 replays twice as fast, 0 disables the delays).
+"""
+import asyncio
+import gzip
+import json
+import logging
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+logger = logging.getLogger(__name__)
+
+SECRET_FIELDS = {"account_id", "api_key", "Authorization"}
+
+def _scrub(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _scrub(v) for k, v in value.items() if k not in SECRET_FIELDS}
+    if isinstance(value, list):
+        return [_scrub(v) for v in value]
+    return value
+
+def _key(method: str, path: str, query: Dict[str, str], body: Any) -> Tuple:
+    return (
+        method,
+        path,
+        tuple(sorted(_scrub(query).items())),
+        json.dumps(_scrub(body), sort_keys=True),
+    )
+
+class ReplayStore:
+    def __init__(self, path: str, speed: float = 1.0):
+        self.speed = speed
+        self.responses: Dict[Tuple, deque] = {}
+        self.last_ok: Dict[Tuple, Dict[str, Any]] = {}
+        opener = gzip.open if path.endswith(".gz") else open
+        count = 0
+        with opener(path, "rt", encoding="utf-8") as capture:
+            for line in capture:
+                event = json.loads(line)
+                if event.get("type") != "upstream":
+                    continue
+                key = _key(event["method"], event["path"], event.get("query") or {}, event.get("body"))
+                self.responses.setdefault(key, deque()).append(event)
+                count += 1
+        logger.info("Loaded %d recorded upstream responses from %s", count, path)
+
+    def match(self, key: Tuple, conditional: bool) -> Optional[Dict[str, Any]]:
+        """
+        Returns the next recorded response for a request, in recorded order;
+        the last one is repeated once the recording is used up.
+        """
+        recorded = self.responses.get(key)
+        if not recorded:
+            return None
+        event = recorded.popleft() if len(recorded) > 1 else recorded[0]
+        if event["status"] == 304 and not conditional and key in self.last_ok:
+            # The client holds no cached copy, so send the full body instead.
+            event = {**self.last_ok[key], "latency": event["latency"]}
+        if 200 <= event["status"] < 300:
+            self.last_ok[key] = event
+        return event
+
+    async def serve(self, request: Request) -> Response:
+        raw = await request.body()
+        body = json.loads(raw) if raw else None
+        key = _key(request.method, request.url.path, dict(request.query_params), body)
+        conditional = "if-none-match" in request.headers or "if-modified-since" in request.headers
+        event = self.match(key, conditional)
+        if event is None:
+            logger.warning("No recorded response for %s %s", request.method, request.url.path)
+            return Response(status_code=404, content=json.dumps({"detail": "No recorded response"}), media_type="application/json")
+        if self.speed > 0:
+            await asyncio.sleep(event["latency"] / self.speed)
+        if event["status"] == 304 or event.get("response") is None:
+            return Response(status_code=event["status"])
+        return Response(status_code=event["status"], content=json.dumps(event["response"]), media_type="application/json")
@@ -0,0 +1,72 @@
+# replay_driver.py
+"""
+Replays the inbound RPC calls of a traffic capture (CAPTURE_FILE) against
+the service, keeping their original arrival times, and prints latency
+percentiles. Run the mock API in replay mode (MOCK_REPLAY_FILE) on the same
+capture to reproduce the upstream side.
+
+    python replay_driver.py capture.jsonl.gz --speed 4
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import time
+
+import httpx
+
+def load_calls(path: str):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as capture:
+        return [event for event in map(json.loads, capture) if event.get("type") == "rpc"]
+
+async def replay(calls, url: str, api_key: str, speed: float):
+    latencies = []
+    errors = 0
+    start = time.monotonic()
+
+    async with httpx.AsyncClient(headers={"X-API-KEY": api_key}, timeout=60) as client:
+        async def send(index, call):
+            nonlocal errors
+            delay = call["t"] / speed - (time.monotonic() - start) if speed > 0 else 0
+            if delay > 0:
+                await asyncio.sleep(delay)
+            sent_at = time.perf_counter()
+            try:
+                response = await client.post(f"{url}/mcp", json={
+                    "jsonrpc": "2.0",
+                    "method": call["method"],
+                    "params": call["params"],
+                    "id": index,
+                })
+                if response.status_code != 200 or response.json().get("error"):
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - sent_at)
+
+        await asyncio.gather(*(send(i, call) for i, call in enumerate(calls)))
+    return sorted(latencies), errors, time.monotonic() - start
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", help="Capture file written with CAPTURE_FILE")
+    parser.add_argument("--url", default="http://localhost:8004/api/v1", help="Base URL of the service")
+    parser.add_argument("--api-key", default=os.getenv("API_KEY", "a-very-secret-api-key"))
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed factor (0 sends everything at once)")
+    args = parser.parse_args()
+
+    calls = load_calls(args.capture)
+    latencies, errors, elapsed = asyncio.run(replay(calls, args.url, args.api_key, args.speed))
+    print(json.dumps({
+        "calls": len(calls),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+    }, indent=2))
@@ -0,0 +1,39 @@
+# tests/unit/test_aggregate.py
+import os
+import pytest
+import httpx
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+import respx
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_aggregate_tickets_streams_all_pages():
+    pages = [
+        [
+            {"rfc_number": "RFC1", "group_id": "GRP-IT", "assigned_to": "Alice", "created_at": "2024-01-01T00:00:00", "updated_at": "2024-02-01T00:00:00"},
+            {"rfc_number": "RFC2", "group_id": "GRP-IT", "assigned_to": "Bob", "created_at": "2024-01-02T00:00:00", "updated_at": "2024-02-02T00:00:00"},
+        ],
+        [
+            {"rfc_number": "RFC3", "group_id": "GRP-FIN", "assigned_to": "Alice", "created_at": "2024-01-03T00:00:00Z", "updated_at": "2024-02-03T00:00:00"},
+        ],
+    ]
+    route = respx.get("http://mock_api:8085/api/v1/tickets").mock(
+        side_effect=[httpx.Response(200, json={"tickets": page}) for page in pages]
+    )
+
+    headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY")}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/v1/mcp", json={
+            "jsonrpc": "2.0",
+            "method": "aggregate_tickets",
+            "params": {"filters": {"status": "Open"}, "page_size": 2, "top_k": 1},
+            "id": 1
+        }, headers=headers)
+    result = response.json()["result"]
+    assert route.call_count == 2
+    assert route.calls[1].request.url.params["offset"] == "2"
+    assert result["total"] == 3
+    assert result["groups"] == [{"group_id": "GRP-IT", "count": 2}, {"group_id": "GRP-FIN", "count": 1}]
+    assert result["top_assignees"] == [{"assigned_to": "Alice", "count": 2}]
+    assert result["age_seconds"]["max"] - result["age_seconds"]["min"] == 2 * 86400
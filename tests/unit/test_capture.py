@@ -0,0 +1,38 @@
+# tests/unit/test_capture.py
+import gzip
+import json
+import os
+import pytest
+import httpx
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+from app.services import capture
+import respx
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_capture_records_rpc_and_upstream_without_secrets(tmp_path):
+    respx.get("http://mock_api:8085/api/v1/tickets").mock(
+        return_value=httpx.Response(200, json={"tickets": [{"rfc_number": "RFC1", "account_id": "acct-123"}]})
+    )
+    path = tmp_path / "capture.jsonl.gz"
+    capture.start_capture(path)
+    try:
+        headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY")}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            await ac.post("/api/v1/mcp", json={
+                "jsonrpc": "2.0", "method": "list_tickets", "params": {"status": "Open", "api_key": "leak"}, "id": 1
+            }, headers=headers)
+    finally:
+        capture.stop_capture()
+
+    with gzip.open(path, "rt") as f:
+        rpc, upstream = [json.loads(line) for line in f]
+    assert rpc["type"] == "rpc" and rpc["params"] == {"status": "Open"}
+    assert upstream["path"] == "/api/v1/tickets"
+    assert upstream["status"] == 200 and upstream["response"]["tickets"][0]["rfc_number"] == "RFC1"
+    assert "account_id" not in upstream["query"]
+    assert "account_id" not in upstream["response"]["tickets"][0]
+    with gzip.open(path, "rt") as f:
+        assert "acct-123" not in f.read()
+    assert upstream["t"] >= rpc["t"]
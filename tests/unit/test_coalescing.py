@@ -0,0 +1,96 @@
+# tests/unit/test_coalescing.py
+import asyncio
+import pytest
+import httpx
+import respx
+from app.core.deadline import deadline_scope, remaining
+from app.services.coalescing import WriteCoalescer
+from app.services.mcp_easyvista_tools import dispatch
+from app.services.tenants import tenant_registry
+
+@pytest.mark.asyncio
+async def test_updates_within_window_share_one_write():
+    coalescer = WriteCoalescer(window=0.05)
+    sent = []
+
+    async def send(params):
+        sent.append(dict(params))
+        return {"rfc_number": "RFC123", **params}
+
+    results = await asyncio.gather(
+        coalescer.submit("RFC123", {"status": "In Progress", "assigned_to": "Bob"}, send),
+        coalescer.submit("RFC123", {"priority": "High"}, send),
+        coalescer.submit("RFC123", {"status": "Pending"}, send),
+    )
+    assert sent == [{"assigned_to": "Bob", "priority": "High", "status": "Pending"}]
+    assert list(sent[0]) == ["assigned_to", "priority", "status"]
+    assert all(result == results[0] for result in results)
+
+@pytest.mark.asyncio
+async def test_failed_write_reaches_every_caller():
+    coalescer = WriteCoalescer(window=0.01)
+
+    async def send(params):
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        coalescer.submit("RFC1", {"status": "Open"}, send),
+        coalescer.submit("RFC1", {"priority": "Low"}, send),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+@pytest.mark.asyncio
+async def test_flush_does_not_inherit_the_first_callers_deadline():
+    coalescer = WriteCoalescer(window=0.2)
+    seen = []
+
+    async def send(params):
+        seen.append(remaining())
+        return params
+
+    async def caller_with_deadline():
+        with deadline_scope(0.05):
+            return await coalescer.submit("RFC1", {"status": "Open"}, send)
+
+    first = asyncio.create_task(caller_with_deadline())
+    await asyncio.sleep(0)
+    second = await coalescer.submit("RFC1", {"priority": "Low"}, send)
+    assert second == {"status": "Open", "priority": "Low"}
+    assert seen == [None]
+    await first
+
+@pytest.mark.asyncio
+async def test_drain_sends_pending_batch_before_next_write():
+    coalescer = WriteCoalescer(window=5.0)
+    sent = []
+
+    async def send(params):
+        sent.append(dict(params))
+        return params
+
+    update = asyncio.create_task(coalescer.submit("RFC1", {"priority": "High"}, send))
+    await asyncio.sleep(0)
+    await coalescer.drain("RFC1")
+    sent.append({"status": "closed"})
+    assert sent == [{"priority": "High"}, {"status": "closed"}]
+    assert await update == {"priority": "High"}
+    assert not coalescer.pending and not coalescer.in_flight
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_close_is_sent_after_a_pending_update(monkeypatch):
+    monkeypatch.setattr(tenant_registry.default, "update_coalescer", WriteCoalescer(window=5.0))
+    order = []
+
+    def record(request):
+        order.append(request.url.path)
+        return httpx.Response(200, json={"rfc_number": "RFC777"})
+
+    respx.put(url__regex=r"http://mock_api:8085/api/v1/tickets/RFC777.*").mock(side_effect=record)
+    async with httpx.AsyncClient() as client:
+        update = asyncio.create_task(dispatch(client, "update_ticket", {"rfc_number": "RFC777", "params": {"priority": "High"}}))
+        await asyncio.sleep(0.01)
+        await dispatch(client, "close_ticket", {"rfc_number": "RFC777", "comment": "done"})
+        await update
+    assert order == ["/api/v1/tickets/RFC777", "/api/v1/tickets/RFC777/close"]
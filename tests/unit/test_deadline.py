@@ -0,0 +1,66 @@
+# tests/unit/test_deadline.py
+import asyncio
+import os
+import time
+import pytest
+import httpx
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+import respx
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_deadline_cancels_slow_upstream_call():
+    async def slow_upstream(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={"rfc_number": "RFC123"})
+
+    respx.get("http://mock_api:8085/api/v1/tickets/RFC123").mock(side_effect=slow_upstream)
+    headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY"), "X-Request-Timeout": "0.2"}
+    start = time.monotonic()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/v1/mcp", json={
+            "jsonrpc": "2.0",
+            "method": "get_ticket",
+            "params": {"rfc_number": "RFC123"},
+            "id": 1
+        }, headers=headers)
+    assert time.monotonic() - start < 2
+    assert response.json()["error"]["code"] == -32001
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_cancelled_dispatch_is_not_retried():
+    from app.services.mcp_easyvista_tools import dispatch
+
+    started = asyncio.Event()
+    sent = []
+
+    async def slow_upstream(request):
+        sent.append(request)
+        started.set()
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={"rfc_number": "RFC124"})
+
+    respx.get("http://mock_api:8085/api/v1/tickets/RFC124").mock(side_effect=slow_upstream)
+    async with httpx.AsyncClient() as client:
+        task = asyncio.create_task(dispatch(client, "get_ticket", {"rfc_number": "RFC124"}))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.3)
+    assert len(sent) == 1
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("budget", [0, -1, "nan", "inf"])
+async def test_non_positive_or_non_finite_timeout_is_rejected(budget):
+    headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY"), "X-Request-Timeout": "30"}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/v1/mcp", json={
+            "jsonrpc": "2.0",
+            "method": "get_ticket",
+            "params": {"rfc_number": "RFC125", "_timeout": budget},
+            "id": 1
+        }, headers=headers)
+    assert response.json()["error"]["code"] == -32602
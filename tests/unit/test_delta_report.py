@@ -0,0 +1,65 @@
+# tests/unit/test_delta_report.py
+import os
+import pytest
+import httpx
+from httpx import AsyncClient, ASGITransport
+from app.core.config import settings
+from app.main import app
+import respx
+
+async def _report(ac, params):
+    headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY")}
+    response = await ac.post("/api/v1/mcp", json={
+        "jsonrpc": "2.0",
+        "method": "generate_report",
+        "params": params,
+        "id": 1
+    }, headers=headers)
+    return response.json()
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_delta_report_resumes_from_token(monkeypatch):
+    monkeypatch.setattr(settings, "EASYVISTA_SUPPORTS_KEYSET", True)
+    route = respx.get("http://mock_api:8085/api/v1/tickets").mock(side_effect=[
+        httpx.Response(200, json={"tickets": [
+            {"rfc_number": "RFC1", "title": "A", "status": "Open", "updated_at": "2024-02-01T00:00:00"},
+            {"rfc_number": "RFC2", "title": "B", "status": "Closed", "updated_at": "2024-02-02T00:00:00"},
+        ]}),
+        httpx.Response(200, json={"tickets": [
+            # RFC2 shares the watermark and was already reported.
+            {"rfc_number": "RFC2", "title": "B", "status": "Closed", "updated_at": "2024-02-02T00:00:00"},
+            {"rfc_number": "RFC3", "title": "C", "status": "Open", "updated_at": "2024-02-03T00:00:00"},
+        ]}),
+    ])
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        first = (await _report(ac, {"report_type": "summary", "since": "2024-01-31T00:00:00"}))["result"]
+        second = (await _report(ac, {"report_type": "summary", "since_token": first["next_token"]}))["result"]
+
+    assert first["changed"] == 2
+    assert first["watermark"] == "2024-02-02T00:00:00"
+    assert route.calls[0].request.url.params["updated_since"] == "2024-01-31T00:00:00"
+    assert route.calls[1].request.url.params["updated_since"] == "2024-02-02T00:00:00"
+    assert second["changed"] == 1
+    assert second["report"] == "Ticket RFC3: C (Open)"
+    assert second["watermark"] == "2024-02-03T00:00:00"
+
+@pytest.mark.asyncio
+async def test_invalid_since_is_rejected():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        body = await _report(ac, {"report_type": "csv", "since": "yesterday"})
+    assert body["error"]["code"] == -32602
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_since_with_offset_is_sent_as_naive_utc(monkeypatch):
+    monkeypatch.setattr(settings, "EASYVISTA_SUPPORTS_KEYSET", True)
+    route = respx.get("http://mock_api:8085/api/v1/tickets").mock(return_value=httpx.Response(200, json={"tickets": [
+        {"rfc_number": "RFC1", "title": "A", "status": "Open", "updated_at": "2024-02-01T00:00:00"},
+    ]}))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        zulu = (await _report(ac, {"report_type": "summary", "since": "2024-01-31T00:00:00Z"}))["result"]
+        offset = (await _report(ac, {"report_type": "summary", "since": "2024-01-31T02:00:00+02:00"}))["result"]
+
+    assert zulu["changed"] == 1 and offset["changed"] == 1
+    assert [call.request.url.params["updated_since"] for call in route.calls] == ["2024-01-31T00:00:00"] * 2
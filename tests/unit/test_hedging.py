@@ -0,0 +1,97 @@
+# tests/unit/test_hedging.py
+import asyncio
+import pytest
+import httpx
+import respx
+from app.core.config import settings
+from app.services.hedging import Hedger
+from app.services.mcp_easyvista_tools import dispatch
+from app.services.scheduling import LaneScheduler
+from app.services.tenants import tenant_registry
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled():
+    hedger = Hedger(budget=1.0, min_delay=0.01, min_samples=1)
+    hedger.latencies.append(0.01)
+    delays = iter([5.0, 0.0])
+    started = []
+
+    async def send():
+        delay = next(delays)
+        task = asyncio.current_task()
+        started.append(task)
+        await asyncio.sleep(delay)
+        return delay
+
+    assert await hedger.run(send) == 0.0
+    assert hedger.hedges_sent == 1 and hedger.hedges_won == 1
+    await asyncio.sleep(0)
+    assert started[0].cancelled()
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_budget():
+    hedger = Hedger(budget=0.0, min_delay=0.01, min_samples=1)
+    hedger.latencies.append(0.01)
+
+    async def send():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    assert await hedger.run(send) == "ok"
+    assert hedger.hedges_sent == 0
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_hedges_stay_within_scheduler_capacity(monkeypatch):
+    tenant = tenant_registry.default
+    monkeypatch.setattr(settings, "EASYVISTA_HEDGE_ENABLED", True)
+    monkeypatch.setattr(tenant, "scheduler", LaneScheduler(capacity=3, reserved=0))
+    hedger = Hedger(budget=1.0, min_delay=0.01, min_samples=1)
+    hedger.latencies.append(0.01)
+    monkeypatch.setattr(tenant, "hedger", hedger)
+    in_flight = 0
+    peak = 0
+
+    async def slow_upstream(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            in_flight -= 1
+        return httpx.Response(200, json={"rfc_number": "RFC300"})
+
+    respx.get(url__regex=r"http://mock_api:8085/api/v1/tickets/RFC3\d\d").mock(side_effect=slow_upstream)
+    async with httpx.AsyncClient() as client:
+        await asyncio.gather(*(dispatch(client, "get_ticket", {"rfc_number": f"RFC3{i:02d}"}) for i in range(2)))
+
+    assert peak <= 3
+    assert tenant.scheduler.in_use == 0
+    # Only one of the two slow reads finds a free slot for its hedge.
+    assert hedger.hedges_sent == 1
+
+@pytest.mark.asyncio
+async def test_cancelled_primary_latency_is_recorded():
+    hedger = Hedger(budget=1.0, min_delay=0.01, min_samples=1)
+    hedger.latencies.append(0.01)
+    delays = iter([5.0, 0.0])
+
+    async def send():
+        await asyncio.sleep(next(delays))
+        return "ok"
+
+    await hedger.run(send)
+    await asyncio.sleep(0)
+    # The hedge and the cancelled primary both leave a sample.
+    assert len(hedger.latencies) == 3
+
+def test_delay_quantile_is_cached_between_recomputes():
+    hedger = Hedger(percentile=0.5, min_delay=0.0, min_samples=1, recompute_every=3)
+    hedger.record(1.0)
+    assert hedger.delay() == 1.0
+    hedger.record(5.0)
+    hedger.record(5.0)
+    assert hedger.delay() == 1.0
+    hedger.record(5.0)
+    assert hedger.delay() == 5.0
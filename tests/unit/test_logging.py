@@ -0,0 +1,41 @@
+# tests/unit/test_logging.py
+import json
+import logging
+import httpx
+import pytest
+import respx
+from tenacity import stop_after_attempt
+from app.core.logging_setup import JsonFormatter, SuccessSampler
+from app.models.rpc import RPCException
+from app.services.mcp_easyvista_tools import _request
+
+def _record(**extra):
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "rpc call ok", None, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_json_line_carries_fields_and_redacts_bodies():
+    record = _record(request_id="abc", method="update_ticket", latency_ms=12.5,
+                     data={"rfc_number": "RFC1", "params": {"title": "secret"}})
+    line = json.loads(JsonFormatter().format(record))
+    assert line["request_id"] == "abc" and line["latency_ms"] == 12.5
+    assert line["data"] == {"rfc_number": "RFC1", "params": "[redacted]"}
+
+def test_sampler_only_drops_sampled_records():
+    sampler = SuccessSampler(rate=0.0)
+    assert not sampler.filter(_record(sampled=True))
+    assert sampler.filter(_record())
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_upstream_error_body_stays_out_of_message():
+    body = {"error": "conflict", "title": "payroll password reset"}
+    url = "http://mock_api:8085/api/v1/tickets/RFC900"
+    respx.get(url).mock(return_value=httpx.Response(409, json=body))
+    once = _request.retry_with(stop=stop_after_attempt(1), reraise=True)
+    async with httpx.AsyncClient() as client:
+        with pytest.raises(RPCException) as raised:
+            await once(client, "GET", url)
+    # The router logs the message; the body is only returned as error data.
+    assert raised.value.error.message == "EasyVista API error: HTTP 409"
+    assert raised.value.error.data == body
@@ -0,0 +1,95 @@
+# tests/unit/test_pagination.py
+import os
+import pytest
+import httpx
+from httpx import AsyncClient, ASGITransport
+from app.core.config import settings
+from app.main import app
+import respx
+
+@pytest.fixture
+def keyset(monkeypatch):
+    monkeypatch.setattr(settings, "EASYVISTA_SUPPORTS_KEYSET", True)
+
+def _by_offset(tickets):
+    def respond(request):
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        return httpx.Response(200, json={"tickets": tickets[offset:offset + limit]})
+    return respond
+
+async def _list(ac, params):
+    headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY")}
+    response = await ac.post("/api/v1/mcp", json={
+        "jsonrpc": "2.0",
+        "method": "list_tickets",
+        "params": params,
+        "id": 1
+    }, headers=headers)
+    return response.json()
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_cursor_pages_skip_already_seen_tickets(keyset):
+    route = respx.get("http://mock_api:8085/api/v1/tickets").mock(side_effect=[
+        httpx.Response(200, json={"tickets": [
+            {"rfc_number": "RFC1", "updated_at": "2024-01-01T00:00:00"},
+            {"rfc_number": "RFC2", "updated_at": "2024-01-02T00:00:00"},
+        ]}),
+        # The upstream repeats RFC2 because it shares the cursor's updated_at.
+        httpx.Response(200, json={"tickets": [
+            {"rfc_number": "RFC2", "updated_at": "2024-01-02T00:00:00"},
+            {"rfc_number": "RFC3", "updated_at": "2024-01-02T00:00:00"},
+        ]}),
+        httpx.Response(200, json={"tickets": []}),
+    ])
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        first = (await _list(ac, {"limit": 2, "cursor": ""}))["result"]
+        second = (await _list(ac, {"limit": 2, "cursor": first["next_cursor"]}))["result"]
+
+    assert [t["rfc_number"] for t in first["tickets"]] == ["RFC1", "RFC2"]
+    assert [t["rfc_number"] for t in second["tickets"]] == ["RFC3"]
+    assert second["next_cursor"] is None
+    assert route.calls[0].request.url.params["sort"] == "updated_at,rfc_number"
+    assert route.calls[1].request.url.params["updated_since"] == "2024-01-02T00:00:00"
+    assert route.calls[2].request.url.params["offset"] == "2"
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        body = await _list(ac, {"cursor": "not-a-cursor"})
+    assert body["error"]["code"] == -32602
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_keyset_scan_skips_tickets_without_updated_at(keyset):
+    route = respx.get("http://mock_api:8085/api/v1/tickets").mock(side_effect=_by_offset([
+        {"rfc_number": "RFC1", "updated_at": "2024-01-01T00:00:00"},
+        {"rfc_number": "RFC2"},
+        {"rfc_number": "RFC3"},
+    ]))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        page = (await _list(ac, {"limit": 2, "cursor": ""}))["result"]
+
+    assert [t["rfc_number"] for t in page["tickets"]] == ["RFC1"]
+    assert page["next_cursor"] is None
+    assert route.call_count == 2
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_offset_scan_without_keyset_support_terminates():
+    route = respx.get("http://mock_api:8085/api/v1/tickets").mock(side_effect=_by_offset([
+        {"rfc_number": f"RFC{i}", "group_id": "GRP-IT"} for i in range(5)
+    ]))
+    headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY")}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/v1/mcp", json={
+            "jsonrpc": "2.0",
+            "method": "aggregate_tickets",
+            "params": {"page_size": 2},
+            "id": 1
+        }, headers=headers)
+
+    assert response.json()["result"]["total"] == 5
+    assert route.call_count == 3
+    assert "sort" not in route.calls[0].request.url.params
@@ -0,0 +1,33 @@
+# tests/unit/test_projection.py
+import os
+import pytest
+import httpx
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+import respx
+
+async def _rpc(method, params):
+    headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY")}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/v1/mcp", json={
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params,
+            "id": 1
+        }, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_list_tickets_projects_fields():
+    respx.get("http://mock_api:8085/api/v1/tickets").mock(return_value=httpx.Response(200, json={"tickets": [
+        {"rfc_number": "RFC123", "title": "Printer", "status": "Open", "group_id": "GRP-IT", "updated_at": "2024-01-01T00:00:00"}
+    ]}))
+    body = await _rpc("list_tickets", {"status": "Open", "fields": ["rfc_number", "status"]})
+    assert body["result"] == [{"rfc_number": "RFC123", "status": "Open"}]
+
+@pytest.mark.asyncio
+async def test_unknown_field_is_rejected():
+    body = await _rpc("get_ticket", {"rfc_number": "RFC123", "fields": ["rfc_number", "nope"]})
+    assert body["error"]["code"] == -32602
@@ -0,0 +1,40 @@
+# tests/unit/test_rendering.py
+import threading
+import pytest
+from app.core.config import settings
+from app.services import rendering
+
+TICKETS = [{"rfc_number": f"RFC{i}", "title": f"T{i}", "status": "Open"} for i in range(5)]
+COLUMNS = ["rfc_number", "title", "status"]
+
+@pytest.mark.asyncio
+async def test_large_reports_render_off_the_event_loop(monkeypatch):
+    threads = []
+    original = rendering.render_report
+
+    def spy(*args):
+        threads.append(threading.current_thread())
+        return original(*args)
+
+    monkeypatch.setattr(rendering, "render_report", spy)
+    monkeypatch.setattr(settings, "REPORT_RENDER_INLINE_ROWS", 3)
+    try:
+        small = await rendering.render("csv", COLUMNS, TICKETS[:2])
+        large = await rendering.render("csv", COLUMNS, TICKETS)
+    finally:
+        rendering.shutdown_render_pool()
+
+    assert threads[0] is threading.main_thread()
+    assert threads[1] is not threading.main_thread()
+    assert small.splitlines()[1] == "RFC0,T0,Open"
+    assert large == original("csv", COLUMNS, TICKETS)
+
+@pytest.mark.asyncio
+async def test_process_pool_renders_same_output(monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_RENDER_INLINE_ROWS", 1)
+    monkeypatch.setattr(settings, "REPORT_RENDER_POOL", "process")
+    try:
+        html = await rendering.render("html", COLUMNS, TICKETS)
+    finally:
+        rendering.shutdown_render_pool()
+    assert html == rendering.render_report("html", COLUMNS, TICKETS)
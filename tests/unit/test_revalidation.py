@@ -0,0 +1,47 @@
+# tests/unit/test_revalidation.py
+import os
+import pytest
+import httpx
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+import respx
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_ticket_history_revalidates_with_etag():
+    history = [{"status": "Open", "changed_at": "2024-01-01T00:00:00"}]
+    route = respx.get("http://mock_api:8085/api/v1/tickets/RFC777/history").mock(side_effect=[
+        httpx.Response(200, json=history, headers={"ETag": '"v1"'}),
+        httpx.Response(304, headers={"ETag": '"v1"'}),
+    ])
+    headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY")}
+    payload = {"jsonrpc": "2.0", "method": "get_ticket_history", "params": {"rfc_number": "RFC777"}, "id": 1}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        first = await ac.post("/api/v1/mcp", json=payload, headers=headers)
+        second = await ac.post("/api/v1/mcp", json=payload, headers=headers)
+    assert "If-None-Match" not in route.calls[0].request.headers
+    assert route.calls[1].request.headers["If-None-Match"] == '"v1"'
+    assert first.json()["result"] == second.json()["result"] == history
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_write_drops_stored_ticket():
+    updated_at = "2024-01-01T00:00:00"
+    route = respx.get("http://mock_api:8085/api/v1/tickets/RFC778").mock(side_effect=[
+        httpx.Response(200, json={"rfc_number": "RFC778", "status": "Open", "updated_at": updated_at}),
+        httpx.Response(200, json={"rfc_number": "RFC778", "status": "closed", "updated_at": updated_at}),
+    ])
+    respx.put("http://mock_api:8085/api/v1/tickets/RFC778/close").mock(return_value=httpx.Response(200, json={
+        "rfc_number": "RFC778", "status": "closed", "updated_at": updated_at,
+    }))
+    headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY")}
+    get = {"jsonrpc": "2.0", "method": "get_ticket", "params": {"rfc_number": "RFC778"}, "id": 1}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.post("/api/v1/mcp", json=get, headers=headers)
+        await ac.post("/api/v1/mcp", json={
+            "jsonrpc": "2.0", "method": "close_ticket", "params": {"rfc_number": "RFC778", "comment": "done"}, "id": 2
+        }, headers=headers)
+        second = await ac.post("/api/v1/mcp", json=get, headers=headers)
+    # Same-second updated_at: a conditional GET could have been answered 304.
+    assert "If-Modified-Since" not in route.calls[1].request.headers
+    assert second.json()["result"]["status"] == "closed"
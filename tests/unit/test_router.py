@@ -3,6 +3,7 @@ import pytest
 import os
 from httpx import ASGITransport, AsyncClient
 from app.main import app
+from app.core.logging_setup import DroppingQueueHandler
 
 @pytest.mark.asyncio
 async def test_health_check():
@@ -13,4 +14,22 @@ async def test_health_check():
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
 
+@pytest.mark.asyncio
+async def test_ready_waits_for_warm_up():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        app.state.ready = False
+        warming = await ac.get("/api/v1/ready")
+        app.state.ready = True
+        ready = await ac.get("/api/v1/ready")
+    assert warming.status_code == 503
+    assert ready.status_code == 200
+
+@pytest.mark.asyncio
+async def test_logging_metrics_report_dropped_records(monkeypatch):
+    monkeypatch.setattr(DroppingQueueHandler, "dropped", 7)
+    headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY")}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/api/v1/metrics/logging", headers=headers)
+    assert response.json() == {"dropped": 7}
+
 # TODO: Add more unit tests for the router
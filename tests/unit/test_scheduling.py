@@ -0,0 +1,46 @@
+# tests/unit/test_scheduling.py
+import asyncio
+import pytest
+from app.services.scheduling import LaneScheduler, classify
+
+def test_methods_map_to_lanes():
+    assert classify("get_ticket") == "interactive"
+    assert classify("generate_report") == "bulk"
+    assert classify("generate_report", "interactive") == "interactive"
+    with pytest.raises(ValueError):
+        classify("get_ticket", "urgent")
+
+@pytest.mark.asyncio
+async def test_reserved_slot_keeps_interactive_moving():
+    scheduler = LaneScheduler(capacity=2, reserved=1)
+    release = asyncio.Event()
+
+    async def bulk_call():
+        async with scheduler.slot("bulk"):
+            await release.wait()
+
+    first = asyncio.ensure_future(bulk_call())
+    second = asyncio.ensure_future(bulk_call())
+    await asyncio.sleep(0)
+    assert scheduler.metrics()["lanes"]["bulk"]["queued"] == 1
+
+    async with scheduler.slot("interactive"):
+        assert scheduler.in_use == 2
+    release.set()
+    await asyncio.gather(first, second)
+    assert scheduler.in_use == 0
+
+@pytest.mark.asyncio
+async def test_busy_lanes_share_slots_by_weight():
+    scheduler = LaneScheduler(capacity=1, reserved=0)
+    order = []
+
+    async def call(lane):
+        async with scheduler.slot(lane):
+            order.append(lane)
+
+    async with scheduler.slot("bulk"):
+        tasks = [asyncio.ensure_future(call(lane)) for lane in ["bulk"] * 3 + ["interactive"] * 3]
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    assert order[:3] == ["interactive"] * 3
@@ -0,0 +1,90 @@
+# tests/unit/test_search.py
+import asyncio
+import os
+import pytest
+import httpx
+from httpx import AsyncClient, ASGITransport
+from app.core.config import settings
+from app.main import app
+from app.services.tenants import tenant_registry
+from app.services.search_index import TicketSearchIndex
+import respx
+
+def test_index_ranks_and_reindexes_updates():
+    index = TicketSearchIndex()
+    index.upsert_many([
+        {"rfc_number": "RFC1", "title": "VPN drops", "description": "VPN disconnects every hour", "status": "Open"},
+        {"rfc_number": "RFC2", "title": "Email slow", "description": "Outlook and VPN are slow", "status": "Closed"},
+        {"rfc_number": "RFC3", "title": "Printer jam", "status": "Open"},
+    ])
+    assert [hit["rfc_number"] for hit in index.search("vpn")] == ["RFC1", "RFC2"]
+    assert [hit["rfc_number"] for hit in index.search("vpn", {"status": "Closed"})] == ["RFC2"]
+
+    index.upsert({"rfc_number": "RFC3", "title": "Printer fixed after VPN reset", "status": "Closed"})
+    assert index.search("jam") == []
+    assert index.search("printer")[0]["status"] == "Closed"
+
+@pytest.fixture
+def fresh_index(monkeypatch):
+    tenant = tenant_registry.default
+    monkeypatch.setattr(tenant, "ticket_index", TicketSearchIndex())
+    yield tenant
+    if tenant.search_refresh is not None:
+        tenant.search_refresh.cancel()
+        tenant.search_refresh = None
+
+async def _search(ac, query):
+    headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY")}
+    response = await ac.post("/api/v1/mcp", json={
+        "jsonrpc": "2.0", "method": "search_tickets", "params": {"query": query}, "id": 2
+    }, headers=headers)
+    return [hit["rfc_number"] for hit in response.json()["result"]]
+
+async def _wait_for_rebuild(tenant, since=None):
+    for _ in range(100):
+        if tenant.ticket_index.loaded_at is not None and tenant.ticket_index.loaded_at != since:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("search index was not rebuilt")
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_search_tickets_uses_listed_tickets(fresh_index):
+    respx.get("http://mock_api:8085/api/v1/tickets").mock(return_value=httpx.Response(200, json={"tickets": [
+        {"rfc_number": "RFC900", "title": "Badge reader broken", "status": "Open", "priority": "High"},
+    ]}))
+    headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY")}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.post("/api/v1/mcp", json={"jsonrpc": "2.0", "method": "list_tickets", "params": {}, "id": 1}, headers=headers)
+        response = await ac.post("/api/v1/mcp", json={
+            "jsonrpc": "2.0",
+            "method": "search_tickets",
+            "params": {"query": "badge", "priority": "High"},
+            "id": 2
+        }, headers=headers)
+    hits = response.json()["result"]
+    assert [hit["rfc_number"] for hit in hits] == ["RFC900"]
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_search_rebuilds_index_in_the_background(fresh_index, monkeypatch):
+    monkeypatch.setattr(settings, "EASYVISTA_SEARCH_REFRESH_INTERVAL", 0.05)
+    fresh_index.ticket_index.upsert({"rfc_number": "RFC903", "title": "Printer deleted upstream"})
+    listing = respx.get("http://mock_api:8085/api/v1/tickets").mock(return_value=httpx.Response(200, json={"tickets": [
+        {"rfc_number": "RFC901", "title": "Laptop battery", "status": "Open"},
+        {"rfc_number": "RFC902", "title": "Printer offline", "status": "Open"},
+    ]}))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        # Served from the current index while the rebuild runs.
+        assert await _search(ac, "printer") == ["RFC903"]
+        await _wait_for_rebuild(fresh_index)
+        assert await _search(ac, "printer") == ["RFC902"]
+        loaded_at = fresh_index.ticket_index.loaded_at
+        await _wait_for_rebuild(fresh_index, since=loaded_at)
+    assert listing.call_count >= 2
+
+def test_upserts_during_rebuild_reach_the_new_index():
+    live = TicketSearchIndex()
+    live.shadow = TicketSearchIndex()
+    live.upsert({"rfc_number": "RFC1", "title": "VPN drops"})
+    assert live.shadow.search("vpn")[0]["rfc_number"] == "RFC1"
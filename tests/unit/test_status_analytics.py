@@ -0,0 +1,75 @@
+# tests/unit/test_status_analytics.py
+import os
+from datetime import datetime, timezone
+import pytest
+import httpx
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+from app.services.status_analytics import StatusAnalytics
+import respx
+
+def test_status_analytics_distributions_and_breaches():
+    now = datetime(2024, 1, 10, tzinfo=timezone.utc)
+    items = [
+        (("High",), [
+            {"status": "Open", "changed_at": "2024-01-01T00:00:00"},
+            {"status": "In Progress", "changed_at": "2024-01-01T02:00:00"},
+            {"status": "Closed", "changed_at": "2024-01-02T00:00:00"},
+        ]),
+        (("High",), [
+            {"status": "Open", "changed_at": "2024-01-01T00:00:00"},
+            {"status": "In Progress", "changed_at": "2024-01-01T06:00:00"},
+        ]),
+        (("Low",), [{"status": "Open", "changed_at": "2024-01-09T23:00:00Z"}]),
+        # Closed through this API: the upstream writes the status in lower case.
+        (("Low",), [
+            {"status": "Open", "changed_at": "2024-01-08T00:00:00"},
+            {"status": "closed", "changed_at": "2024-01-08T01:00:00"},
+        ]),
+    ]
+    analytics = StatusAnalytics({"Open": 4 * 3600, "In Progress": 24 * 3600, "closed": 60}, now=now)
+    for key, history in items:
+        analytics.add(key, history)
+    high, low = analytics.result()
+
+    assert high["group"] == ("High",) and high["tickets"] == 2
+    assert high["time_in_status"]["Open"] == {"count": 2, "avg": 4 * 3600, "p50": 6 * 3600, "p90": 6 * 3600, "max": 6 * 3600}
+    assert high["transitions"][0] == {"from": "Open", "to": "In Progress", "count": 2}
+    # The second ticket is still in progress after more than a day.
+    assert high["sla_breach_rate"] == {"Open": 0.5, "In Progress": 0.5}
+    assert low["time_in_status"]["Open"]["count"] == 1
+    assert low["sla_breach_rate"] == {"Open": 0.0, "closed": 0.0}
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_closed_ticket_histories_are_cached():
+    respx.get("http://mock_api:8085/api/v1/tickets").mock(return_value=httpx.Response(200, json={"tickets": [
+        {"rfc_number": "RFCA1", "priority": "High", "status": "closed", "updated_at": "2024-01-02T00:00:00"},
+        {"rfc_number": "RFCA2", "priority": "High", "status": "Open", "updated_at": "2024-01-03T00:00:00"},
+    ]}))
+    closed = respx.get("http://mock_api:8085/api/v1/tickets/RFCA1/history").mock(return_value=httpx.Response(200, json=[
+        {"status": "Open", "changed_at": "2024-01-01T00:00:00"},
+        {"status": "closed", "changed_at": "2024-01-02T00:00:00"},
+    ]))
+    opened = respx.get("http://mock_api:8085/api/v1/tickets/RFCA2/history").mock(return_value=httpx.Response(200, json=[
+        {"status": "Open", "changed_at": "2024-01-03T00:00:00"},
+    ]))
+
+    headers = {"X-API-KEY": os.getenv("EASYVISTA_TOOL_API_KEY")}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        for _ in range(2):
+            response = await ac.post("/api/v1/mcp", json={
+                "jsonrpc": "2.0",
+                "method": "ticket_status_analytics",
+                "params": {"sla_seconds": {"Open": 3600}},
+                "id": 1
+            }, headers=headers)
+            result = response.json()["result"]
+
+    assert closed.call_count == 1
+    assert opened.call_count == 2
+    assert result["total"] == 2 and result["histories_fetched"] == 1
+    group = result["groups"][0]
+    assert group["priority"] == "High"
+    assert group["time_in_status"]["Open"]["count"] == 1
+    assert group["sla_breach_rate"] == {"Open": 1.0}
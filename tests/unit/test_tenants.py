@@ -0,0 +1,90 @@
+# tests/unit/test_tenants.py
+import asyncio
+import json
+import os
+import pytest
+import httpx
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+from app.core.config import settings
+from app.services import tenants
+from app.services.tenants import tenant_registry
+import respx
+
+@pytest.fixture
+def tenants_file(tmp_path, monkeypatch):
+    path = tmp_path / "tenants.json"
+    path.write_text(json.dumps({
+        "finance": {
+            "tool_api_key": "finance-key",
+            "url": "http://finance.easyvista.test",
+            "api_key": "finance-upstream-key",
+            "account_id": "FIN",
+            "max_concurrency": 2,
+        }
+    }))
+    monkeypatch.setattr(settings, "EASYVISTA_TENANTS_FILE", path)
+    tenant_registry.reload_if_changed()
+    yield path
+    monkeypatch.setattr(settings, "EASYVISTA_TENANTS_FILE", None)
+    tenant_registry.tenants = {}
+    tenant_registry._index()
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_api_key_routes_to_its_tenant(tenants_file):
+    route = respx.get("http://finance.easyvista.test/api/v1/tickets/RFC1").mock(
+        return_value=httpx.Response(200, json={"rfc_number": "RFC1"})
+    )
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/v1/mcp", json={
+            "jsonrpc": "2.0",
+            "method": "get_ticket",
+            "params": {"rfc_number": "RFC1"},
+            "id": 1
+        }, headers={"X-API-KEY": "finance-key"})
+        unknown = await ac.post("/api/v1/mcp", json={
+            "jsonrpc": "2.0", "method": "get_ticket", "params": {"rfc_number": "RFC1"}, "id": 2
+        }, headers={"X-API-KEY": "other-key"})
+    assert response.json()["result"] == {"rfc_number": "RFC1"}
+    assert route.calls[0].request.headers["Authorization"] == "Bearer finance-upstream-key"
+    assert unknown.status_code == 401
+    await tenant_registry.tenants["finance"].aclose()
+
+def test_tenants_file_is_reloaded(tenants_file):
+    finance = tenant_registry.resolve("finance-key")
+    config = json.loads(tenants_file.read_text())
+    config["finance"]["tool_api_key"] = "rotated-key"
+    tenants_file.write_text(json.dumps(config))
+    os.utime(tenants_file, (0, 12345))
+    tenant_registry.reload_if_changed()
+    assert tenant_registry.resolve("finance-key") is None
+    assert tenant_registry.resolve("rotated-key") is not finance
+    assert tenant_registry.resolve(os.getenv("EASYVISTA_TOOL_API_KEY")) is tenant_registry.default
+
+def test_duplicate_tool_api_keys_are_rejected(tenants_file):
+    finance = tenant_registry.resolve("finance-key")
+    config = json.loads(tenants_file.read_text())
+    config["payroll"] = {**config["finance"], "account_id": "PAY"}
+    tenants_file.write_text(json.dumps(config))
+    os.utime(tenants_file, (0, 23456))
+    tenant_registry.reload_if_changed()
+    assert tenant_registry.resolve("finance-key") is finance
+    assert "payroll" not in tenant_registry.tenants
+
+@pytest.mark.asyncio
+async def test_watch_reloads_in_the_background(tenants_file, monkeypatch):
+    monkeypatch.setattr(tenants, "RELOAD_INTERVAL", 0.01)
+    config = json.loads(tenants_file.read_text())
+    config["finance"]["tool_api_key"] = "watched-key"
+    tenants_file.write_text(json.dumps(config))
+    os.utime(tenants_file, (0, 34567))
+    watcher = asyncio.create_task(tenant_registry.watch())
+    try:
+        for _ in range(100):
+            if tenant_registry.resolve("watched-key"):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        watcher.cancel()
+    assert tenant_registry.resolve("watched-key") is not None
@@ -0,0 +1,55 @@
+# tests/unit/test_warmup.py
+import asyncio
+from types import SimpleNamespace
+import pytest
+import httpx
+import respx
+from app.core.config import TenantConfig, settings
+from app.services import warmup
+from app.services.search_index import TicketSearchIndex
+from app.services.tenants import Tenant, tenant_registry
+from app.services.warmup import warm_up_tenant
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_warm_up_probes_skip_the_search_index(monkeypatch):
+    tenant = tenant_registry.default
+    monkeypatch.setattr(tenant, "ticket_index", TicketSearchIndex())
+    listing = respx.get("http://mock_api:8085/api/v1/tickets").mock(return_value=httpx.Response(200, json={"tickets": [
+        {"rfc_number": "RFC950", "title": "Printer offline", "status": "Open"},
+    ]}))
+
+    async with httpx.AsyncClient() as client:
+        await warm_up_tenant(tenant, client)
+        assert len(tenant.ticket_index) == 0
+
+        monkeypatch.setattr(settings, "WARMUP_PREFETCH", True)
+        await warm_up_tenant(tenant, client)
+    assert len(tenant.ticket_index) == 1
+    assert listing.calls[-1].request.url.params["status"] == "Open"
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_unreachable_secondary_tenant_does_not_block_readiness(monkeypatch):
+    broken = Tenant("broken", TenantConfig(
+        tool_api_key="broken-key", url="http://broken.easyvista.test", api_key="k", account_id="B",
+    ))
+    monkeypatch.setattr(tenant_registry, "tenants", {"broken": broken})
+    monkeypatch.setattr(warmup, "RETRY_INTERVAL", 0.01)
+    respx.get("http://mock_api:8085/api/v1/tickets").mock(return_value=httpx.Response(200, json={"tickets": []}))
+    broken_route = respx.get("http://broken.easyvista.test/api/v1/tickets").mock(return_value=httpx.Response(503))
+    app = SimpleNamespace(state=SimpleNamespace(ready=False))
+
+    async with httpx.AsyncClient() as client:
+        app.state.http_client = client
+        task = asyncio.create_task(warmup.warm_up(app))
+        for _ in range(100):
+            if app.state.ready and broken_route.call_count > 3:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    await broken.aclose()
+    assert app.state.ready
+    # The broken tenant keeps being retried on its own.
+    assert broken_route.call_count > 3